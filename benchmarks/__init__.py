@@ -0,0 +1,34 @@
+"""
+Benchmarks for locallibrary project.
+
+Run them from the repository root as modules, e.g. ``python -m benchmarks.ratelimit``.
+They use the "bench" settings profile unless DJANGO_SETTINGS_PROFILE says otherwise.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "locallibrary.settings")
+    os.environ.setdefault("DJANGO_SETTINGS_PROFILE", "bench")
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Creates a throwaway copy of the default database (a temporary file for SQLite) and removes it afterwards.
+    """
+    from django.db import connection
+
+    if connection.vendor == "sqlite":
+        directory = tempfile.mkdtemp(prefix="locallibrary-bench-")
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(directory, "bench.sqlite3")
+    name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(name, verbosity=0)
@@ -0,0 +1,43 @@
+"""
+Background job throughput: jobs per second for one run_worker process.
+
+Queues no-op jobs in a throwaway database and drains them with
+``run_worker --burst`` at several thread counts, so the numbers show the
+queue's own overhead (claiming, bookkeeping, deleting finished jobs).
+"""
+
+import argparse
+import time
+
+from benchmarks import setup_django, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    from catalog import jobs
+    from catalog.models import Job
+
+    @jobs.task("bench_noop")
+    def noop(number):
+        pass
+
+    with test_database() as connection:
+        print(f"database: {connection.vendor}, {args.jobs} jobs per run")
+        for threads in args.threads:
+            Job.objects.bulk_create([Job(task="bench_noop", payload={"number": i}) for i in range(args.jobs)])
+            started = time.perf_counter()
+            call_command("run_worker", burst=True, threads=threads, verbosity=0)
+            elapsed = time.perf_counter() - started
+            left = Job.objects.count()
+            print(f"threads {threads:>2}: {args.jobs / elapsed:8.1f} jobs/s ({left} left in queue)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Load test of the gunicorn deployment.
+
+Seeds a throwaway SQLite database, then for each worker configuration
+starts gunicorn (with gunicorn.conf.py and the bench settings profile),
+drives the catalog URLs with asyncio keep-alive HTTP clients for a fixed
+duration and reports throughput, latency percentiles and error rate.
+
+Configurations are written CLASS:WORKERS:THREADS, for example::
+
+    python -m benchmarks.loadtest --configs sync:2:1 gthread:2:4 gthread:4:2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import setup_django
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def seed(books, copies_per_book):
+    """
+    Fills the database with authors, genres, books and copies; returns sample paths to request.
+    """
+    from catalog.isbn import isbn13_check_digit
+    from catalog.models import Author, Book, BookInstance, Genre, Language
+
+    language = Language.objects.create(name="English")
+    genres = Genre.objects.bulk_create([Genre(name=f"Genre {i}") for i in range(20)])
+    authors = Author.objects.bulk_create([Author(first_name=f"First {i}", last_name=f"Last {i}")
+                                          for i in range(max(1, books // 3))])
+    created = []
+    for i in range(books):
+        isbn = f"978{i:09d}"
+        book = Book.objects.create(title=f"Book {i}", summary="Summary " * 50, isbn=isbn + isbn13_check_digit(isbn),
+                                   language=language)
+        book.author.set(random.sample(authors, min(2, len(authors))))
+        book.genre.set(random.sample(genres, 2))
+        created.append(book)
+    statuses = "aaaomr"
+    BookInstance.objects.bulk_create([BookInstance(book=book, status=random.choice(statuses))
+                                      for book in created for _ in range(copies_per_book)])
+
+    paths = ["/catalog/", "/catalog/books/", "/catalog/books/?page=2", "/catalog/authors/"]
+    paths += [f"/catalog/book/{book.pk}" for book in random.sample(created, min(20, len(created)))]
+    paths += [f"/catalog/author/{author.pk}" for author in random.sample(authors, min(10, len(authors)))]
+    paths += [f"/catalog/isbn/{book.isbn}/" for book in random.sample(created, min(10, len(created)))]
+    return paths
+
+
+async def fetch(reader, writer, path):
+    """
+    Sends one keep-alive GET and reads the whole response; returns the status
+    code and whether the server keeps the connection open.
+    """
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def client(port, paths, deadline, latencies, errors):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        path = random.choice(paths)
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, keep_alive = await fetch(reader, writer, path)
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as exc:
+            errors.append(type(exc).__name__)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if not keep_alive:
+            # Sync workers close every connection; reconnecting is part of their cost.
+            writer.close()
+            reader = writer = None
+        if status >= 400:
+            errors.append(status)
+
+
+async def drive(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(client(port, paths, deadline, latencies, errors) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("gunicorn did not start listening in time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", nargs="+", default=["sync:2:1", "gthread:2:4", "gthread:4:4"],
+                        help="Worker configurations as CLASS:WORKERS:THREADS.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent HTTP clients.")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load per configuration.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured load first.")
+    parser.add_argument("--books", type=int, default=300)
+    parser.add_argument("--copies-per-book", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="locallibrary-loadtest-") as workdir:
+        env = dict(os.environ,
+                   DJANGO_SETTINGS_PROFILE="bench",
+                   DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'db.sqlite3')}",
+                   DJANGO_CACHE_DIR=os.path.join(workdir, "cache"))
+        os.environ.update(env)
+        subprocess.run([sys.executable, "manage.py", "migrate", "--verbosity", "0"], cwd=ROOT, env=env, check=True)
+        setup_django()
+        paths = seed(args.books, args.copies_per_book)
+        print(f"database: {env['DATABASE_URL']}, {len(paths)} URLs, {args.concurrency} clients, "
+              f"{args.duration:.0f}s per configuration")
+        print(f"{'config':<16}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'errors':>10}")
+
+        for config in args.configs:
+            worker_class, workers, threads = config.split(":")
+            port = free_port()
+            process = subprocess.Popen(
+                ["gunicorn", "locallibrary.wsgi", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{port}",
+                 "--worker-class", worker_class, "--workers", workers, "--threads", threads,
+                 "--log-level", "warning"],
+                cwd=ROOT, env=env)
+            try:
+                wait_for_port(port, process)
+                asyncio.run(drive(port, paths, args.concurrency, args.warmup))
+                latencies, errors = asyncio.run(drive(port, paths, args.concurrency, args.duration))
+            finally:
+                process.terminate()
+                process.wait()
+            latencies.sort()
+            total = len(latencies) + sum(1 for error in errors if not isinstance(error, int))
+            error_rate = len(errors) / total * 100 if total else 100.0
+            print(f"{config:<16}{len(latencies) / args.duration:>10.1f}"
+                  f"{percentile(latencies, 0.5) * 1000:>10.1f}{percentile(latencies, 0.9) * 1000:>10.1f}"
+                  f"{percentile(latencies, 0.99) * 1000:>10.1f}{error_rate:>9.1f}%")
+
+        from django.db import connections
+        connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-request overhead of RateLimitMiddleware.
+
+Times a bare view callable against the same callable wrapped in the
+middleware, for a rate-limited URL and for one that is not limited.
+"""
+
+import argparse
+import time
+
+from benchmarks import setup_django
+
+
+def timed(handler, requests):
+    started = time.perf_counter()
+    for request in requests:
+        handler(request)
+    return (time.perf_counter() - started) / len(requests) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=500, help="Distinct client IPs.")
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest import mock
+
+    from django.conf import settings
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+
+    from catalog import middleware
+
+    factory = RequestFactory()
+
+    def view(request):
+        return HttpResponse("ok")
+
+    with override_settings(RATELIMIT_ENABLE=True), \
+            mock.patch.dict(middleware.rate_limits, {"books": (10 ** 9, 60)}):
+        limiter = middleware.RateLimitMiddleware(view)
+        print(f"cache backend: {settings.CACHES['default']['BACKEND']}, {args.requests} requests, {args.clients} clients")
+        for path in ["/catalog/books/", "/catalog/book/1"]:
+            requests = [factory.get(path, REMOTE_ADDR=f"10.0.{i % args.clients // 256}.{i % 256}")
+                        for i in range(args.requests)]
+            bare = timed(view, requests)
+            limited = timed(limiter, requests)
+            print(f"{path:<20} bare {bare:7.2f} us   with middleware {limited:7.2f} us   "
+                  f"overhead {limited - bare:7.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
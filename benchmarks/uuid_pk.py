@@ -0,0 +1,60 @@
+"""
+BookInstance primary keys: random UUID4 against time-ordered UUID7.
+
+Bulk inserts the same number of copies into a fresh database with each id
+generator and reports insert throughput and the on-disk size of the table
+and each of its indexes. Uses the configured database engine (SQLite
+unless DATABASE_URL points elsewhere).
+"""
+
+import argparse
+import time
+import uuid
+
+from benchmarks import setup_django, test_database
+
+
+def relation_sizes(connection):
+    """
+    Bytes allocated to catalog_bookinstance and each of its indexes.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT dbstat.name, SUM(pgsize) FROM dbstat JOIN sqlite_schema USING (name) "
+                           "WHERE tbl_name = 'catalog_bookinstance' GROUP BY dbstat.name ORDER BY dbstat.name")
+            return cursor.fetchall()
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT 'catalog_bookinstance', pg_relation_size('catalog_bookinstance') UNION ALL "
+                           "SELECT indexrelname::text, pg_relation_size(indexrelid) FROM pg_stat_user_indexes "
+                           "WHERE relname = 'catalog_bookinstance' ORDER BY 1")
+            return cursor.fetchall()
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from catalog.ids import uuid7
+    from catalog.models import Book, BookInstance
+
+    for label, generate in [("uuid4", uuid.uuid4), ("uuid7", uuid7)]:
+        with test_database() as connection:
+            book = Book.objects.create(title="Benchmark", summary="", isbn="9780306406157")
+            started = time.perf_counter()
+            for offset in range(0, args.rows, args.batch_size):
+                BookInstance.objects.bulk_create([
+                    BookInstance(id=generate(), book=book, status="a")
+                    for _ in range(min(args.batch_size, args.rows - offset))
+                ])
+            elapsed = time.perf_counter() - started
+            print(f"{label}: {args.rows / elapsed:10.0f} rows/s ({connection.vendor})")
+            for name, size in relation_sizes(connection):
+                print(f"    {name:<45} {size / 1024:10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Author, Genre, Book, BookInstance, Language
+from .models import AuditLog, Author, Genre, Book, BookInstance, Branch, Language, Loan
 
 # admin.site.register(Author)
 
@@ -8,34 +8,39 @@ from .models import Author, Genre, Book, BookInstance, Language
 class BooksInLine(admin.TabularInline):
     model = Book.author.through
     extra = 0
+    autocomplete_fields = ["book"]
 
 
 class AuthorAdmin(admin.ModelAdmin):
     list_display = ["last_name", "first_name",
                     "date_of_birth", "date_of_death"]
     fields = ["first_name", "last_name", ("date_of_birth", "date_of_death")]
+    search_fields = ["last_name", "first_name"]
     inlines = [BooksInLine]
 
 
 class BooksInstanceInLine(admin.TabularInline):
     model = BookInstance
     extra = 0
-    fields = ["book", "id", "status", "due_back"]
+    fields = ["book", "id", "branch", "status", "due_back"]
 
 
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = ["title", "display_author", "display_genre"]
+    search_fields = ["title"]
+    autocomplete_fields = ["author", "genre", "language"]
     inlines = [BooksInstanceInLine]
 
 
 @admin.register(BookInstance)
 class BookInstanceAdmin(admin.ModelAdmin):
-    list_display = ["book", "status", "borrower", "due_back", "id"]
-    list_filter = ["status", "due_back"]
+    list_display = ["book", "branch", "status", "borrower", "due_back", "id"]
+    list_filter = ["branch", "status", "due_back"]
+    autocomplete_fields = ["book", "borrower"]
     fieldsets = [
         (None,
-         {"fields": ["book", "id"]},
+         {"fields": ["book", "id", "branch"]},
          ),
         ("Availability",
          {"fields": ["status", "due_back", "borrower"]}
@@ -43,8 +48,41 @@ class BookInstanceAdmin(admin.ModelAdmin):
     ]
 
 
+@admin.register(Loan)
+class LoanAdmin(admin.ModelAdmin):
+    list_display = ["book", "borrower", "checked_out", "due_back", "returned"]
+    list_filter = ["returned"]
+    list_select_related = ["book", "borrower"]
+    autocomplete_fields = ["book", "borrower"]
+    raw_id_fields = ["copy"]
+
+
+@admin.register(AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ["timestamp", "user", "action", "content_type", "object_repr"]
+    list_filter = ["action", "content_type", "timestamp"]
+    list_select_related = ["user", "content_type"]
+    search_fields = ["object_repr", "object_id"]
+    readonly_fields = ["timestamp", "user", "action", "content_type", "object_id", "object_repr", "changes"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Branch)
+class BranchAdmin(admin.ModelAdmin):
+    list_display = ["name"]
+    filter_horizontal = ["librarians"]
+
+
+@admin.register(Genre, Language)
+class NameAdmin(admin.ModelAdmin):
+    search_fields = ["name"]
+
+
 admin.site.register(Author, AuthorAdmin)
-admin.site.register(Genre)
 # admin.site.register(Book)
 # admin.site.register(BookInstance)
-admin.site.register(Language)
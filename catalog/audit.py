@@ -0,0 +1,142 @@
+"""
+Audit log of catalog edits.
+
+Saves and deletions of books, authors and book copies, and changes to the
+authors and genres of a book, become AuditLog entries recording who changed
+which fields and when. Old values come from what the instance was loaded
+with (LoadedValuesMixin), so recording a change reads nothing from the
+database.
+
+Entries join the database transaction of the change and, once it commits,
+a per-thread buffer. AuditMiddleware opens the buffer for each request and
+writes it with one bulk_create when the request ends, or sooner every
+AUDIT_FLUSH_EVERY entries. Outside ``buffered()`` entries are written at
+once, one per change.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .models import AuditLog, Author, Book, BookInstance
+
+_local = threading.local()
+
+
+@contextmanager
+def buffered(user=None):
+    """
+    Buffers the entries recorded inside the block, attributed to ``user``, and writes them at the end.
+    """
+    if getattr(_local, "buffer", None) is not None:
+        yield
+        return
+    _local.buffer, _local.user = [], user
+    try:
+        yield
+    finally:
+        try:
+            flush()
+        finally:
+            _local.buffer = _local.user = None
+
+
+def flush():
+    """
+    Writes the buffered entries of this thread now.
+    """
+    entries = getattr(_local, "buffer", None)
+    if entries:
+        _local.buffer = []
+        AuditLog.objects.bulk_create(entries)
+
+
+def _add(entry):
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        AuditLog.objects.bulk_create([entry])
+        return
+    buffer.append(entry)
+    if len(buffer) >= settings.AUDIT_FLUSH_EVERY:
+        flush()
+
+
+def _current_user_id():
+    user = getattr(_local, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.pk
+    return None
+
+
+def describe(instance):
+    """
+    Text identifying ``instance`` in the log, built without queries.
+    """
+    if isinstance(instance, BookInstance) and not BookInstance.book.is_cached(instance):
+        return str(instance.pk)
+    return str(instance)[:200]
+
+
+def record(action, instance, changes=None):
+    """
+    Logs ``action`` ('c', 'u' or 'd') on ``instance`` once its transaction commits.
+    """
+    entry = AuditLog(user_id=_current_user_id(), action=action,
+                     content_type=ContentType.objects.get_for_model(instance),
+                     object_id=str(instance.pk), object_repr=describe(instance), changes=changes or {})
+    transaction.on_commit(lambda: _add(entry), using=instance._state.db)
+
+
+def _saved(sender, instance, created, raw, update_fields, **kwargs):
+    if raw:
+        return
+    loaded = {} if created else getattr(instance, "_loaded_values", {})
+    changes = {}
+    for field in sender._meta.concrete_fields:
+        if field.primary_key or (update_fields is not None and field.name not in update_fields):
+            continue
+        if not created and field.attname not in loaded:
+            # Deferred when loaded, so neither saved nor known.
+            continue
+        old, new = loaded.get(field.attname), getattr(instance, field.attname)
+        if old != new and not (created and new in (None, "")):
+            changes[field.name] = [old, new]
+    if created or changes:
+        record("c" if created else "u", instance, changes)
+
+
+def _deleted(sender, instance, **kwargs):
+    record("d", instance)
+
+
+def _relation_changed(field, instance, action, reverse, pk_set, **kwargs):
+    name = field.remote_field.get_accessor_name() if reverse else field.name
+    if not isinstance(instance, (Author, Book)):
+        return
+    if action == "pre_clear":
+        pk_set = set(getattr(instance, name).values_list("pk", flat=True))
+        change = "removed"
+    elif action in ("post_add", "post_remove"):
+        change = "added" if action == "post_add" else "removed"
+    else:
+        return
+    if pk_set:
+        record("u", instance, {name: {change: sorted(pk_set)}})
+
+
+def _book_authors_changed(sender, **kwargs):
+    _relation_changed(Book.author.field, **kwargs)
+
+
+def _book_genres_changed(sender, **kwargs):
+    _relation_changed(Book.genre.field, **kwargs)
+
+
+for model in (Author, Book, BookInstance):
+    post_save.connect(_saved, sender=model, dispatch_uid=f"audit-{model._meta.model_name}-save")
+    post_delete.connect(_deleted, sender=model, dispatch_uid=f"audit-{model._meta.model_name}-delete")
+m2m_changed.connect(_book_authors_changed, sender=Book.author.through, dispatch_uid="audit-book-authors")
+m2m_changed.connect(_book_genres_changed, sender=Book.genre.through, dispatch_uid="audit-book-genres")
@@ -0,0 +1,116 @@
+"""
+Prefix search for the autocomplete endpoint.
+
+Each searchable model gets a sorted in-memory index of lower-cased keys, so a
+lookup is a binary search plus a short scan. Indexes are built lazily per
+process. Once a save or delete of a model commits, a version counter in the
+cache is bumped, and a process rebuilds its copy the next time it sees a
+newer version. The cache may be per process (LocMemCache), so every copy is
+also rebuilt once it is AUTOCOMPLETE_INDEX_MAX_AGE seconds old.
+"""
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Author, Book, Genre, Language
+
+
+def _book_entries():
+    for pk, title in Book.objects.values_list("pk", "title"):
+        yield title, pk, title
+
+
+def _author_entries():
+    for pk, first_name, last_name in Author.objects.values_list("pk", "first_name", "last_name"):
+        label = f"{last_name}, {first_name}"
+        yield last_name, pk, label
+        yield first_name, pk, label
+
+
+def _name_entries(model):
+    def entries():
+        for pk, name in model.objects.values_list("pk", "name"):
+            yield name, pk, name
+    return entries
+
+
+# Autocomplete kind -> (model, function yielding (key, pk, label) entries).
+SOURCES = {
+    "book": (Book, _book_entries),
+    "author": (Author, _author_entries),
+    "genre": (Genre, _name_entries(Genre)),
+    "language": (Language, _name_entries(Language)),
+}
+
+
+class PrefixIndex:
+    """
+    Sorted (key, label, pk) entries searchable by key prefix.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted((key.lower(), label, pk) for key, pk, label in entries if key)
+        self.keys = [entry[0] for entry in self.entries]
+
+    def search(self, prefix, limit=20):
+        prefix = prefix.lower()
+        results = []
+        seen = set()
+        for position in range(bisect_left(self.keys, prefix), len(self.entries)):
+            key, label, pk = self.entries[position]
+            if not key.startswith(prefix) or len(results) >= limit:
+                break
+            if pk not in seen:
+                seen.add(pk)
+                results.append({"id": pk, "text": label})
+        return results
+
+
+_indexes = {}
+
+
+def _version_key(kind):
+    return f"autocomplete:{kind}:version"
+
+
+def get_index(kind):
+    """
+    The process-local index for ``kind``, rebuilt when the data changed or it got too old.
+    """
+    cache.add(_version_key(kind), 0, timeout=None)
+    version = cache.get(_version_key(kind), 0)
+    now = time.monotonic()
+    local = _indexes.get(kind)
+    if local is None or local[0] != version or now - local[1] >= settings.AUTOCOMPLETE_INDEX_MAX_AGE:
+        local = (version, now, PrefixIndex(SOURCES[kind][1]()))
+        _indexes[kind] = local
+    return local[2]
+
+
+def search(kind, prefix, limit=20):
+    return get_index(kind).search(prefix, limit)
+
+
+def invalidate(kind):
+    cache.add(_version_key(kind), 0, timeout=None)
+    try:
+        cache.incr(_version_key(kind))
+    except ValueError:
+        cache.set(_version_key(kind), 1, timeout=None)
+    _indexes.pop(kind, None)
+
+
+def _invalidate_on_change(sender, **kwargs):
+    for kind, (model, _entries) in SOURCES.items():
+        if sender is model:
+            # After the commit, so no process rebuilds at the new version from uncommitted rows.
+            transaction.on_commit(lambda kind=kind: invalidate(kind))
+
+
+for _model, _entries in SOURCES.values():
+    post_save.connect(_invalidate_on_change, sender=_model, dispatch_uid=f"autocomplete-save-{_model.__name__}")
+    post_delete.connect(_invalidate_on_change, sender=_model, dispatch_uid=f"autocomplete-delete-{_model.__name__}")
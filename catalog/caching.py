@@ -0,0 +1,87 @@
+"""
+Cached fragments of the book and author detail pages.
+
+The body of book_detail.html and author_detail.html is cached per object
+for DETAIL_CACHE_TIMEOUT seconds. The receivers below drop the fragments
+whose content a change affects, including renamed genres, languages and
+branches shown on book pages, so pages are never stale for long even with
+a long timeout. warm_cache fills the fragments again after a deploy.
+"""
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from .models import Author, Book, BookInstance, Branch, Genre, Language
+
+BOOK_FRAGMENT = "book_detail"
+AUTHOR_FRAGMENT = "author_detail"
+
+
+def invalidate(book_ids=(), author_ids=()):
+    """
+    Drops the cached detail fragments of the given books and authors.
+    """
+    keys = [make_template_fragment_key(BOOK_FRAGMENT, [pk]) for pk in book_ids]
+    keys += [make_template_fragment_key(AUTHOR_FRAGMENT, [pk]) for pk in author_ids]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_books(book_ids):
+    """
+    Drops the fragments of the books and of the author pages listing them.
+    """
+    author_ids = Book.author.through.objects.filter(book_id__in=book_ids).values_list("author_id", flat=True)
+    invalidate(book_ids, set(author_ids))
+
+
+def _book_changed(sender, instance, **kwargs):
+    invalidate_books([instance.pk])
+
+
+def _copy_changed(sender, instance, **kwargs):
+    invalidate_books([instance.book_id])
+
+
+def _author_changed(sender, instance, **kwargs):
+    book_ids = Book.author.through.objects.filter(author_id=instance.pk).values_list("book_id", flat=True)
+    invalidate(set(book_ids), [instance.pk])
+
+
+def _genre_changed(sender, instance, **kwargs):
+    invalidate(set(Book.genre.through.objects.filter(genre_id=instance.pk).values_list("book_id", flat=True)))
+
+
+def _language_changed(sender, instance, **kwargs):
+    invalidate(set(Book.objects.filter(language_id=instance.pk).values_list("pk", flat=True)))
+
+
+def _branch_changed(sender, instance, **kwargs):
+    invalidate(set(BookInstance.objects.filter(branch_id=instance.pk).values_list("book_id", flat=True)))
+
+
+def _book_authors_changed(sender, instance, reverse, pk_set, **kwargs):
+    if reverse:
+        invalidate(pk_set or (), [instance.pk])
+    else:
+        # Covers the current authors too, which pre_clear still sees.
+        invalidate_books([instance.pk])
+        invalidate((), pk_set or ())
+
+
+def _book_genres_changed(sender, instance, reverse, pk_set, **kwargs):
+    invalidate((pk_set or ()) if reverse else [instance.pk])
+
+
+post_save.connect(_book_changed, sender=Book, dispatch_uid="fragment-book-save")
+pre_delete.connect(_book_changed, sender=Book, dispatch_uid="fragment-book-delete")
+post_save.connect(_copy_changed, sender=BookInstance, dispatch_uid="fragment-copy-save")
+post_delete.connect(_copy_changed, sender=BookInstance, dispatch_uid="fragment-copy-delete")
+post_save.connect(_author_changed, sender=Author, dispatch_uid="fragment-author-save")
+pre_delete.connect(_author_changed, sender=Author, dispatch_uid="fragment-author-delete")
+for model, receiver in [(Genre, _genre_changed), (Language, _language_changed), (Branch, _branch_changed)]:
+    name = model._meta.model_name
+    post_save.connect(receiver, sender=model, dispatch_uid=f"fragment-{name}-save")
+    pre_delete.connect(receiver, sender=model, dispatch_uid=f"fragment-{name}-delete")
+m2m_changed.connect(_book_authors_changed, sender=Book.author.through, dispatch_uid="fragment-book-authors")
+m2m_changed.connect(_book_genres_changed, sender=Book.genre.through, dispatch_uid="fragment-book-genres")
@@ -0,0 +1,140 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.utils.module_loading import import_string
+
+PERFORMANCE_TAG = "performance"
+
+CACHED_TEMPLATE_LOADER = "django.template.loaders.cached.Loader"
+SLOW_SESSION_ENGINES = ["django.contrib.sessions.backends.db",
+                        "django.contrib.sessions.backends.file"]
+CACHED_SESSION_ENGINES = ["django.contrib.sessions.backends.cache",
+                          "django.contrib.sessions.backends.cached_db"]
+SLOW_CACHE_BACKENDS = ["django.core.cache.backends.dummy.DummyCache",
+                       "django.core.cache.backends.db.DatabaseCache"]
+PER_PROCESS_CACHE_BACKENDS = ["django.core.cache.backends.locmem.LocMemCache"]
+
+
+@register(PERFORMANCE_TAG, Tags.caches, deploy=True)
+def check_cache_backend(app_configs, **kwargs):
+    """
+    The default cache must actually store something and must not go to the database.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend in SLOW_CACHE_BACKENDS:
+        return [Warning(f"The default cache uses {backend}.",
+                        hint="Use the local-memory, file-based or Redis cache backend.",
+                        id="catalog.W001")]
+    return []
+
+
+@register(PERFORMANCE_TAG, Tags.caches, deploy=True)
+def check_detail_cache(app_configs, **kwargs):
+    """
+    Detail fragments are invalidated in the cache of the process that made the change,
+    so they may only be cached in a cache every process shares.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if settings.DETAIL_CACHE_TIMEOUT and backend in PER_PROCESS_CACHE_BACKENDS:
+        return [Warning(f"Detail pages are cached in {backend}, which each process keeps to itself; "
+                        "other workers serve stale pages for up to DETAIL_CACHE_TIMEOUT seconds.",
+                        hint="Use a shared cache (REDIS_URL or DJANGO_CACHE_DIR) or set DETAIL_CACHE_TIMEOUT = 0.",
+                        id="catalog.W009")]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_session_engine(app_configs, **kwargs):
+    """
+    Sessions should be read from the cache, not from the database or disk,
+    and only from a cache every process shares.
+    """
+    if settings.SESSION_ENGINE in SLOW_SESSION_ENGINES:
+        return [Warning(f"SESSION_ENGINE is {settings.SESSION_ENGINE}, which hits storage on every request.",
+                        hint="Use django.contrib.sessions.backends.cached_db with a shared cache.",
+                        id="catalog.W002")]
+    backend = settings.CACHES.get(settings.SESSION_CACHE_ALIAS, {}).get("BACKEND")
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES and backend in PER_PROCESS_CACHE_BACKENDS:
+        return [Warning(f"Sessions are cached in {backend}, which each process keeps to itself; "
+                        "a session ended in one worker stays valid in the others.",
+                        hint="Use a shared cache (REDIS_URL or DJANGO_CACHE_DIR).",
+                        id="catalog.W002")]
+    return []
+
+
+@register(PERFORMANCE_TAG, Tags.templates, deploy=True)
+def check_template_loaders(app_configs, **kwargs):
+    """
+    Templates should be compiled once per process by the cached loader.
+    """
+    errors = []
+    for engine in settings.TEMPLATES:
+        if engine["BACKEND"] != "django.template.backends.django.DjangoTemplates":
+            continue
+        options = engine.get("OPTIONS", {})
+        loaders = options.get("loaders")
+        if loaders is None:
+            # Django wraps the default loaders in the cached loader unless debugging.
+            cached = not options.get("debug", settings.DEBUG)
+        else:
+            first = loaders[0] if loaders else None
+            cached = isinstance(first, (list, tuple)) and first[0] == CACHED_TEMPLATE_LOADER
+        if not cached:
+            errors.append(Warning("Templates are not loaded through the cached template loader.",
+                                  hint=f"Wrap the template loaders in {CACHED_TEMPLATE_LOADER}.",
+                                  id="catalog.W003"))
+    return errors
+
+
+@register(PERFORMANCE_TAG, Tags.database, deploy=True)
+def check_persistent_connections(app_configs, **kwargs):
+    """
+    Database connections should be reused between requests and health checked.
+    """
+    errors = []
+    for alias, database in settings.DATABASES.items():
+        if not database.get("CONN_MAX_AGE"):
+            errors.append(Warning(f"Database {alias!r} opens a new connection for every request.",
+                                  hint="Set CONN_MAX_AGE to a positive number of seconds or None.",
+                                  id="catalog.W004"))
+        elif not database.get("CONN_HEALTH_CHECKS"):
+            errors.append(Warning(f"Database {alias!r} reuses connections without health checks.",
+                                  hint="Set CONN_HEALTH_CHECKS to True.",
+                                  id="catalog.W005"))
+    return errors
+
+
+@register(PERFORMANCE_TAG, Tags.staticfiles, deploy=True)
+def check_static_files(app_configs, **kwargs):
+    """
+    Static files should be served compressed with cache-friendly names.
+    """
+    backend = settings.STORAGES.get("staticfiles", {}).get("BACKEND", "")
+    if "Compressed" not in import_string(backend).__name__:
+        return [Warning(f"Static files are stored with {backend}, which does not compress them.",
+                        hint="Use whitenoise.storage.CompressedManifestStaticFilesStorage.",
+                        id="catalog.W006")]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_gzip_middleware(app_configs, **kwargs):
+    """
+    Dynamic responses should be gzipped.
+    """
+    if "django.middleware.gzip.GZipMiddleware" not in settings.MIDDLEWARE:
+        return [Warning("GZipMiddleware is not installed, HTML responses are sent uncompressed.",
+                        hint="Add django.middleware.gzip.GZipMiddleware after WhiteNoiseMiddleware.",
+                        id="catalog.W007")]
+    return []
+
+
+@register(PERFORMANCE_TAG, deploy=True)
+def check_debug(app_configs, **kwargs):
+    """
+    DEBUG keeps every SQL query in memory and disables template caching.
+    """
+    if settings.DEBUG:
+        return [Warning("DEBUG is True.",
+                        hint="Run with DJANGO_SETTINGS_PROFILE=prod.",
+                        id="catalog.W008")]
+    return []
@@ -3,6 +3,8 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 import datetime #for checking renewal date range.
+from .models import Book
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 class RenewBookForm(forms.Form):
     renewal_date = forms.DateField(help_text="Enter a date between now and 4 weeks (default 3).")
@@ -19,4 +21,19 @@ class RenewBookForm(forms.Form):
             raise ValidationError(_('Invalid date - renewal more than 4 weeks ahead'))
 
         # Помните, что всегда надо возвращать "очищенные" данные.
-        return data
\ No newline at end of file
+        return data
+
+
+class BookForm(forms.ModelForm):
+    """
+    Book create/update form with autocomplete widgets for the related tables.
+    """
+
+    class Meta:
+        model = Book
+        fields = "__all__"
+        widgets = {
+            "author": AutocompleteSelectMultiple("author"),
+            "genre": AutocompleteSelectMultiple("genre"),
+            "language": AutocompleteSelect("language"),
+        }
@@ -0,0 +1,64 @@
+"""
+Detail page hit counting.
+
+Hits are counted in memory and handed to the job queue in batches, either
+every HIT_FLUSH_EVERY hits or every HIT_FLUSH_INTERVAL seconds, so a page
+view never waits on a counter UPDATE. The totals decide which pages the
+warm_cache command renders first after a deploy.
+"""
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import F
+
+from .jobs import enqueue
+from .models import PageHit
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def record(url_name, object_id):
+    """
+    Counts one visit of the ``url_name`` page for ``object_id``.
+    """
+    with _lock:
+        _pending[url_name, int(object_id)] += 1
+        due = (_pending.total() >= settings.HIT_FLUSH_EVERY
+               or time.monotonic() - _last_flush >= settings.HIT_FLUSH_INTERVAL)
+    if due:
+        flush_pending()
+
+
+def flush_pending():
+    """
+    Hands every buffered hit to the job queue now.
+    """
+    global _last_flush
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if batch:
+        enqueue("record_hits", hits=[[url_name, object_id, count] for (url_name, object_id), count in batch.items()])
+
+
+def save_hits(hits):
+    """
+    Adds ``[url_name, object_id, count]`` rows to the stored totals.
+    """
+    PageHit.objects.bulk_create([PageHit(url_name=url_name, object_id=object_id) for url_name, object_id, _ in hits],
+                                ignore_conflicts=True)
+    for url_name, object_id, count in hits:
+        PageHit.objects.filter(url_name=url_name, object_id=object_id).update(hits=F("hits") + count)
+
+
+def most_visited(url_name, limit):
+    """
+    Object ids of the ``limit`` most visited ``url_name`` pages.
+    """
+    return list(PageHit.objects.filter(url_name=url_name).order_by("-hits")
+                .values_list("object_id", flat=True)[:limit])
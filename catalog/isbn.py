@@ -0,0 +1,43 @@
+"""
+ISBN normalization.
+
+Books are looked up by their ISBN-13 regardless of how the code was typed
+or scanned: hyphens and spaces are dropped and ISBN-10 codes are converted
+by prefixing 978 and recomputing the check digit.
+"""
+import re
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+_SEPARATORS = re.compile(r"[\s-]")
+
+
+def isbn13_check_digit(first_twelve):
+    total = sum(int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(first_twelve))
+    return str(-total % 10)
+
+
+def normalize(value):
+    """
+    Returns the ISBN-13 for an ISBN-10 or ISBN-13, raising ValueError if it is malformed or fails its checksum.
+    """
+    code = _SEPARATORS.sub("", value or "").upper()
+    if len(code) == 10 and code[:9].isdigit() and (code[9].isdigit() or code[9] == "X"):
+        check = 10 if code[9] == "X" else int(code[9])
+        if (sum(int(digit) * (10 - position) for position, digit in enumerate(code[:9])) + check) % 11:
+            raise ValueError(f"{value!r} fails the ISBN-10 checksum")
+        first_twelve = "978" + code[:9]
+        return first_twelve + isbn13_check_digit(first_twelve)
+    if len(code) == 13 and code.isdigit():
+        if isbn13_check_digit(code[:12]) != code[12]:
+            raise ValueError(f"{value!r} fails the ISBN-13 checksum")
+        return code
+    raise ValueError(f"{value!r} is not an ISBN-10 or ISBN-13")
+
+
+def validate_isbn(value):
+    try:
+        normalize(value)
+    except ValueError:
+        raise ValidationError(_("Enter a valid ISBN-10 or ISBN-13."), code="invalid")
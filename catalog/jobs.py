@@ -0,0 +1,92 @@
+"""
+Database-backed background jobs.
+
+Tasks are plain functions registered with ``@task``. ``enqueue()`` stores a
+Job row in the caller's transaction, and ``manage.py run_worker`` claims due
+jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` and runs them in a thread
+pool. With JOBS_RUN_INLINE (the default outside production) ``enqueue()``
+runs the task immediately instead.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+def task(name):
+    """
+    Registers a function as the task called ``name``.
+    """
+    def register(function):
+        _tasks[name] = function
+        return function
+    return register
+
+
+def enqueue(name, max_attempts=5, **payload):
+    """
+    Queues ``name`` to run with the JSON-serializable ``payload`` as keyword arguments.
+    """
+    if name not in _tasks:
+        raise KeyError(f"Unknown task {name!r}")
+    if settings.JOBS_RUN_INLINE:
+        _tasks[name](**payload)
+        return None
+    return Job.objects.create(task=name, payload=payload, max_attempts=max_attempts)
+
+
+def backoff(attempts):
+    """
+    Delay before retrying a job that has failed ``attempts`` times.
+    """
+    seconds = settings.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.JOBS_RETRY_MAX_DELAY))
+
+
+def claim(batch_size, lease=300):
+    """
+    Marks up to ``batch_size`` due jobs as running for ``lease`` seconds and returns them.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(Job.objects.select_for_update(skip_locked=True)
+                    .filter(status__in=["q", "r"], run_after__lte=now)
+                    .order_by("run_after")[:batch_size])
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status="r", run_after=now + timedelta(seconds=lease), attempts=F("attempts") + 1)
+    for job in jobs:
+        job.status = "r"
+        job.attempts += 1
+    return jobs
+
+
+def run(job):
+    """
+    Runs a claimed job: deletes it on success, reschedules or fails it on error.
+    """
+    try:
+        _tasks[job.task](**job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed, attempt %s of %s", job.pk, job.task, job.attempts, job.max_attempts)
+        if job.attempts >= job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(status="f", last_error=traceback.format_exc())
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status="q", run_after=timezone.now() + backoff(job.attempts), last_error=traceback.format_exc())
+        return False
+    else:
+        Job.objects.filter(pk=job.pk).delete()
+        return True
+    finally:
+        close_old_connections()
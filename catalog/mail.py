@@ -0,0 +1,47 @@
+import base64
+from email.mime.base import MIMEBase
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .jobs import enqueue
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Queues each message as a send_email job; the worker delivers it with JOBS_EMAIL_BACKEND.
+
+    Attachments travel base64-encoded in the job. Messages with ready-made
+    MIME parts as attachments cannot be stored as JSON and are sent at once.
+    """
+
+    def send_messages(self, email_messages):
+        direct = []
+        for message in email_messages:
+            if any(isinstance(attachment, MIMEBase) for attachment in message.attachments):
+                direct.append(message)
+                continue
+            enqueue("send_email",
+                    subject=message.subject,
+                    body=message.body,
+                    from_email=message.from_email,
+                    to=list(message.to),
+                    cc=list(message.cc),
+                    bcc=list(message.bcc),
+                    reply_to=list(message.reply_to),
+                    headers=message.extra_headers,
+                    alternatives=[list(a) for a in getattr(message, "alternatives", [])],
+                    attachments=[encode_attachment(*a) for a in message.attachments])
+        if direct:
+            get_connection(settings.JOBS_EMAIL_BACKEND, fail_silently=self.fail_silently).send_messages(direct)
+        return len(email_messages)
+
+
+def encode_attachment(filename, content, mimetype):
+    """
+    An attachment as a JSON-serializable [filename, base64 content, mimetype] list.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    return [filename, base64.b64encode(content).decode("ascii"), mimetype]
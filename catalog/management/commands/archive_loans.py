@@ -0,0 +1,51 @@
+import calendar
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.models import Loan, LoanArchive
+
+
+def months_before(day, months):
+    """
+    The same day of the month ``months`` months before ``day``, clamped to the month's length.
+    """
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class Command(BaseCommand):
+    help = "Move returned loans older than N months from the live loan table into the archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months", type=int, default=12,
+                            help="Archive loans returned more than this many months ago.")
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Loans moved per transaction.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Only report how many loans would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = months_before(date.today(), options["months"])
+        old_loans = Loan.objects.filter(returned__lt=cutoff)
+        if options["dry_run"]:
+            self.stdout.write(f"{old_loans.count()} loans returned before {cutoff} would be archived.")
+            return
+
+        moved = 0
+        while True:
+            with transaction.atomic():
+                batch = list(old_loans.order_by("pk").select_for_update(skip_locked=True)[:options["batch_size"]])
+                if not batch:
+                    break
+                LoanArchive.objects.bulk_create([
+                    LoanArchive(copy_id=loan.copy_id, book_id=loan.book_id, borrower_id=loan.borrower_id,
+                                checked_out=loan.checked_out, due_back=loan.due_back, returned=loan.returned)
+                    for loan in batch
+                ])
+                Loan.objects.filter(pk__in=[loan.pk for loan in batch]).delete()
+            moved += len(batch)
+            self.stdout.write(f"Archived {moved} loans...")
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} loans returned before {cutoff}."))
@@ -0,0 +1,82 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog import caching, recommendations
+from catalog.models import Book, BookRecommendation, Loan, LoanArchive
+
+
+def id_pairs(queryset, *fields):
+    """
+    Reads two id columns into an (n, 2) int64 array.
+    """
+    return np.array(list(queryset.order_by().values_list(*fields)), dtype=np.int64).reshape(-1, 2)
+
+
+def to_book_rows(pairs, column, book_ids):
+    """
+    Replaces the book ids in ``column`` by their row in the sorted ``book_ids``.
+
+    Books added after ``book_ids`` was read are dropped, since the queries
+    do not share a snapshot.
+    """
+    rows = np.searchsorted(book_ids, pairs[:, column])
+    known = rows < len(book_ids)
+    known[known] = book_ids[rows[known]] == pairs[known, column]
+    pairs = pairs[known]
+    pairs[:, column] = rows[known]
+    return pairs
+
+
+class Command(BaseCommand):
+    help = ("Rebuild the \"readers also borrowed\" lists of every book from the live and archived "
+            "loan history and shared authors and genres.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-k", type=int, default=10, help="Recommendations kept per book.")
+        parser.add_argument("--author-weight", type=float, default=0.5,
+                            help="Weight of the shared-author score next to co-borrowing.")
+        parser.add_argument("--genre-weight", type=float, default=0.25,
+                            help="Weight of the shared-genre score next to co-borrowing.")
+        parser.add_argument("--max-group", type=int, default=500,
+                            help="Borrowers and authors with more books than this are left out.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per INSERT.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        book_ids = np.array(list(Book.objects.order_by("pk").values_list("pk", flat=True)), dtype=np.int64)
+
+        loans = np.concatenate([
+            id_pairs(loans.filter(borrower__isnull=False, book__isnull=False).distinct(), "borrower_id", "book_id")
+            for loans in (Loan.objects, LoanArchive.objects)])
+        loans = np.unique(loans, axis=0)
+        authorship = id_pairs(Book.author.through.objects, "author_id", "book_id")
+        genres = id_pairs(Book.genre.through.objects, "book_id", "genre_id")
+        # Number books 0..n-1 in pk order.
+        loans = to_book_rows(loans, 1, book_ids)
+        authorship = to_book_rows(authorship, 1, book_ids)
+        genres = to_book_rows(genres, 0, book_ids)
+
+        book, recommended, score, rank = recommendations.build(
+            len(book_ids), loans, authorship, genres, top_k=options["top_k"],
+            author_weight=options["author_weight"], genre_weight=options["genre_weight"],
+            max_group=options["max_group"])
+        rows = zip(book_ids[book].tolist(), book_ids[recommended].tolist(), score.tolist(), rank.tolist())
+
+        with transaction.atomic():
+            BookRecommendation.objects.all().delete()
+            BookRecommendation.objects.bulk_create(
+                (BookRecommendation(book_id=book_id, recommended_id=recommended_id, score=value, rank=position)
+                 for book_id, recommended_id, value, position in rows),
+                batch_size=options["batch_size"])
+            # Every list may have changed, so every cached book page is out of date.
+            transaction.on_commit(lambda: self.invalidate_fragments(book_ids.tolist(), options["batch_size"]))
+        if options["verbosity"]:
+            self.stdout.write(f"{len(book)} recommendations for {len(np.unique(book))} of {len(book_ids)} books "
+                              f"from {len(loans)} borrower-book pairs in {time.monotonic() - started:.1f}s.")
+
+    def invalidate_fragments(self, book_ids, batch_size):
+        for start in range(0, len(book_ids), batch_size):
+            caching.invalidate(book_ids[start:start + batch_size])
@@ -0,0 +1,11 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from catalog.checks import PERFORMANCE_TAG
+
+
+class Command(BaseCommand):
+    help = "Fail if any setting puts the request path on a slow code path."
+
+    def handle(self, *args, **options):
+        call_command("check", deploy=True, tags=[PERFORMANCE_TAG], fail_level="WARNING")
@@ -0,0 +1,59 @@
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(output):
+    """
+    Parse ``python -X importtime`` stderr into (self_us, cumulative_us, module) rows.
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        rows.append((int(fields[0]), int(fields[1]), fields[2].rstrip()))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report import-time cost, boot time and peak RSS of a fresh process importing the WSGI app."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", default=settings.WSGI_APPLICATION.rsplit(".", 1)[0],
+                            help="Module to import in the child process.")
+        parser.add_argument("--limit", type=int, default=25, help="Number of modules to list.")
+        parser.add_argument("--sort", choices=["self", "cumulative"], default="cumulative")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        child = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {options['module']}"],
+                               env=os.environ.copy(), capture_output=True, text=True)
+        elapsed = time.perf_counter() - started
+        if child.returncode:
+            raise CommandError(child.stderr.strip().splitlines()[-1])
+
+        rows = parse_importtime(child.stderr)
+        key = 0 if options["sort"] == "self" else 1
+        rows.sort(key=lambda row: row[key], reverse=True)
+
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        if sys.platform == "darwin":
+            max_rss //= 1024
+
+        self.stdout.write(f"{'self [us]':>10} {'cumulative':>10}  module")
+        for self_us, cumulative_us, module in rows[:options["limit"]]:
+            self.stdout.write(f"{self_us:>10} {cumulative_us:>10}  {module.strip()}")
+        self.stdout.write("")
+        self.stdout.write(f"Modules imported: {len(rows)}")
+        self.stdout.write(f"Total self import time: {sum(row[0] for row in rows) / 1000:.1f} ms")
+        self.stdout.write(f"Process boot time: {elapsed * 1000:.1f} ms")
+        self.stdout.write(f"Peak RSS: {max_rss / 1024:.1f} MiB")
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from catalog.models import AuthorCirculation, BookCirculation, GenreCirculation, Loan, LoanArchive
+
+# Rollup model, its key column and the path from a loan to that key.
+ROLLUPS = [
+    (BookCirculation, "book_id", "book"),
+    (GenreCirculation, "genre_id", "book__genre"),
+    (AuthorCirculation, "author_id", "book__author"),
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily circulation rollups from the live and archived loan history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows read and written per database round trip.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        for model, key, path in ROLLUPS:
+            # One GROUP BY per loan table; the database does the counting.
+            counts = Counter()
+            for loans in (Loan.objects, LoanArchive.objects):
+                grouped = (loans.filter(**{f"{path}__isnull": False})
+                           .order_by()
+                           .values_list(path, "checked_out")
+                           .annotate(loans=Count("id")))
+                for pk, day, number in grouped.iterator(chunk_size=batch_size):
+                    counts[pk, day] += number
+
+            with transaction.atomic():
+                model.objects.all().delete()
+                model.objects.bulk_create(
+                    (model(**{key: pk}, day=day, loans=number) for (pk, day), number in counts.items()),
+                    batch_size=batch_size)
+            self.stdout.write(f"{model._meta.verbose_name}: {len(counts)} rows")
+        self.stdout.write(self.style.SUCCESS("Circulation statistics rebuilt."))
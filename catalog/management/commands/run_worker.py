@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from catalog import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs in a thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Jobs run concurrently.")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Jobs claimed per query (default: twice the thread count).")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--lease", type=int, default=300,
+                            help="Seconds before a claimed but unfinished job may be claimed again.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or options["threads"] * 2
+        # A single thread runs jobs in the main thread, sharing its database connection.
+        executor = None
+        if options["threads"] > 1:
+            executor = ThreadPoolExecutor(max_workers=options["threads"], thread_name_prefix="job")
+        run_all = executor.map if executor else map
+        done = failed = 0
+        try:
+            while True:
+                claimed = jobs.claim(batch_size, lease=options["lease"])
+                if not claimed:
+                    if options["burst"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+                for succeeded in run_all(jobs.run, claimed):
+                    if succeeded:
+                        done += 1
+                    else:
+                        failed += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor:
+                executor.shutdown()
+        if options["verbosity"]:
+            self.stdout.write(f"Jobs done: {done}, failed: {failed}")
@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from catalog import hits
+
+
+class Command(BaseCommand):
+    help = ("Render the most visited book and author pages so that the first visitors "
+            "after a deploy hit warm detail fragments.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=100, help="Most visited book pages to render.")
+        parser.add_argument("--authors", type=int, default=50, help="Most visited author pages to render.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Pages rendered at the same time.")
+        parser.add_argument("--time-budget", type=float, default=60.0,
+                            help="Seconds after which pages not yet started are skipped.")
+
+    def handle(self, *args, **options):
+        backend = settings.CACHES["default"]["BACKEND"]
+        if backend.endswith("LocMemCache") and options["verbosity"]:
+            self.stderr.write(f"The default cache is {backend}: fragments rendered here "
+                              "stay in this process and do not reach the web workers.")
+
+        paths = [reverse("book-detail", args=[pk]) for pk in hits.most_visited("book-detail", options["books"])]
+        paths += [reverse("author-detail", args=[pk])
+                  for pk in hits.most_visited("author-detail", options["authors"])]
+
+        deadline = time.monotonic() + options["time_budget"]
+        factory = RequestFactory()
+
+        def render(path):
+            if time.monotonic() > deadline:
+                return None
+            try:
+                request = factory.get(path)
+                request.user = AnonymousUser()
+                match = resolve(request.path_info)
+                response = match.func(request, *match.args, **match.kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                return response.status_code
+            except Http404:
+                return 404
+            finally:
+                close_old_connections()
+
+        started = time.monotonic()
+        if options["concurrency"] > 1:
+            with ThreadPoolExecutor(max_workers=options["concurrency"], thread_name_prefix="warm") as executor:
+                futures = [executor.submit(render, path) for path in paths]
+                wait(futures, timeout=max(0, deadline - time.monotonic()))
+                executor.shutdown(wait=True, cancel_futures=True)
+            results = [future.result() if not future.cancelled() and future.exception() is None else "error"
+                       for future in futures]
+        else:
+            # One page at a time runs in this thread, sharing its database connection.
+            results = [render(path) for path in paths]
+
+        rendered = results.count(200)
+        skipped = results.count(None)
+        if options["verbosity"]:
+            self.stdout.write(f"Rendered {rendered} of {len(paths)} pages in {time.monotonic() - started:.1f}s "
+                              f"({len(paths) - rendered - skipped} failed or not found, {skipped} skipped).")
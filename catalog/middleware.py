@@ -0,0 +1,111 @@
+import math
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+from . import audit
+from .urls import rate_limits
+
+
+class RateLimitMiddleware:
+    """
+    Throttles clients per URL name before sessions, authentication or views run.
+
+    Every limited request is counted in two buckets, one per client IP and one
+    per session cookie, using a sliding window: the count for the current
+    fixed window plus the previous window's count weighted by how much of it
+    still overlaps. Counters live in the cache and are bumped with atomic
+    increments, so all workers share them when the cache is shared.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cache = caches[settings.RATELIMIT_CACHE]
+
+    def __call__(self, request):
+        if settings.RATELIMIT_ENABLE:
+            retry_after = self.check(request)
+            if retry_after:
+                response = HttpResponse("Too many requests, slow down.", status=429, content_type="text/plain")
+                response["Retry-After"] = str(retry_after)
+                return response
+        return self.get_response(request)
+
+    def check(self, request):
+        """
+        Counts the request and returns seconds to wait if it is over the limit, else 0.
+        """
+        url_name = url_name_for(request.path_info)
+        if url_name not in rate_limits:
+            return 0
+        limit, window = rate_limits[url_name]
+        buckets = [f"ip:{client_ip(request)}"]
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if session_key:
+            buckets.append(f"session:{session_key}")
+        return max(self.hit(f"{url_name}:{bucket}", limit, window) for bucket in buckets)
+
+    def hit(self, bucket, limit, window):
+        now = time.time()
+        current = int(now // window)
+        elapsed = now - current * window
+        key = f"ratelimit:{bucket}:{current}"
+        self.cache.add(key, 0, timeout=window * 2)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # The counter expired between add() and incr().
+            self.cache.set(key, 1, timeout=window * 2)
+            count = 1
+        previous = self.cache.get(f"ratelimit:{bucket}:{current - 1}", 0)
+        if previous * (window - elapsed) / window + count <= limit:
+            return 0
+        if count < limit:
+            # Wait until the previous window's share has decayed below the remaining allowance.
+            wait = (window - elapsed) - (limit - count) * window / previous
+        else:
+            # This window alone is over the limit: wait until it decays in the next one.
+            wait = (window - elapsed) + window * (1 - limit / count)
+        return max(1, math.ceil(wait))
+
+
+@lru_cache(maxsize=4096)
+def url_name_for(path):
+    """
+    Resolves a path to its URL name, remembering recent paths so most requests skip the regex walk.
+    """
+    try:
+        return resolve(path).url_name
+    except Resolver404:
+        return None
+
+
+def client_ip(request):
+    """
+    The client address, taken from X-Forwarded-For when behind RATELIMIT_PROXY_COUNT trusted proxies.
+    """
+    if settings.RATELIMIT_PROXY_COUNT:
+        forwarded = [ip.strip() for ip in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if ip.strip()]
+        if len(forwarded) >= settings.RATELIMIT_PROXY_COUNT:
+            return forwarded[-settings.RATELIMIT_PROXY_COUNT]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+class AuditMiddleware:
+    """
+    Writes the audit entries of a request in one batch when it ends.
+
+    Goes after AuthenticationMiddleware, so entries are attributed to the
+    signed-in user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit.buffered(getattr(request, "user", None)):
+            return self.get_response(request)
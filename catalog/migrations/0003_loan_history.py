@@ -0,0 +1,94 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:29
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_bookinstance_borrower'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Loan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_out', models.DateField(default=datetime.date.today)),
+                ('due_back', models.DateField(blank=True, null=True)),
+                ('returned', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-checked_out'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='LoanArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_out', models.DateField(default=datetime.date.today)),
+                ('due_back', models.DateField(blank=True, null=True)),
+                ('returned', models.DateField(blank=True, null=True)),
+                ('archived', models.DateField(default=datetime.date.today)),
+            ],
+            options={
+                'ordering': ['-checked_out'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bookinstance',
+            index=models.Index(fields=['borrower', 'status', 'due_back'], name='bookinstance_borrower_idx'),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='book',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.book'),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='borrower',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='loan',
+            name='copy',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.bookinstance'),
+        ),
+        migrations.AddField(
+            model_name='loanarchive',
+            name='book',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.book'),
+        ),
+        migrations.AddField(
+            model_name='loanarchive',
+            name='borrower',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='loanarchive',
+            name='copy',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='catalog.bookinstance'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['borrower', '-checked_out'], name='loan_borrower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['copy', 'returned'], name='loan_copy_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['returned'], name='loan_returned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loanarchive',
+            index=models.Index(fields=['borrower', '-checked_out'], name='loanarchive_borrower_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_loan_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookCirculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.book')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreCirculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.genre')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='AuthorCirculation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('loans', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.author')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['day', 'author'], name='authorcirculation_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='authorcirculation',
+            constraint=models.UniqueConstraint(models.F('author'), models.F('day'), name='authorcirculation_author_day_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='bookcirculation',
+            index=models.Index(fields=['day', 'book'], name='bookcirculation_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookcirculation',
+            constraint=models.UniqueConstraint(models.F('book'), models.F('day'), name='bookcirculation_book_day_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='genrecirculation',
+            index=models.Index(fields=['day', 'genre'], name='genrecirculation_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='genrecirculation',
+            constraint=models.UniqueConstraint(models.F('genre'), models.F('day'), name='genrecirculation_genre_day_unique'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_job_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageHit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_name', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('hits', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['url_name', '-hits'], name='pagehit_most_visited_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pagehit',
+            constraint=models.UniqueConstraint(models.F('url_name'), models.F('object_id'), name='pagehit_page_unique'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:39
+
+import catalog.isbn
+from django.db import migrations, models
+
+
+def fill_isbn13(apps, schema_editor):
+    """
+    Normalizes the ISBNs already stored; invalid or duplicate codes are left without an ISBN-13.
+    """
+    Book = apps.get_model('catalog', 'Book')
+    seen = set()
+    for book in Book.objects.only('id', 'isbn').iterator():
+        try:
+            isbn13 = catalog.isbn.normalize(book.isbn)
+        except ValueError:
+            continue
+        if isbn13 not in seen:
+            seen.add(isbn13)
+            Book.objects.filter(pk=book.pk).update(isbn13=isbn13)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_page_hits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='isbn13',
+            field=models.CharField(editable=False, help_text='Normalized ISBN-13 used for lookups', max_length=13, null=True, unique=True, verbose_name='ISBN-13'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='isbn',
+            field=models.CharField(help_text='Enter the ISBN-10 or ISBN-13 of the book, hyphens allowed', max_length=17, unique=True, validators=[catalog.isbn.validate_isbn], verbose_name='ISBN'),
+        ),
+        migrations.RunPython(fill_isbn13, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:40
+
+import catalog.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_isbn13'),
+    ]
+
+    # The default is applied in Python only: the column and the existing ids
+    # (and the renew-book-librarian URLs built from them) stay untouched, and
+    # SQLite does not rebuild the table.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='bookinstance',
+                    name='id',
+                    field=models.UUIDField(default=catalog.ids.new_bookinstance_id, help_text='Unique ID for this particular book across whole library', primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0008_time_ordered_bookinstance_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Branch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Enter the name of the branch', max_length=100, unique=True)),
+                ('librarians', models.ManyToManyField(blank=True, help_text="Librarians who manage this branch's loans", related_name='library_branches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'branches',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='bookinstance',
+            name='branch',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='catalog.branch'),
+        ),
+        migrations.AddIndex(
+            model_name='bookinstance',
+            index=models.Index(fields=['branch', 'status', 'due_back'], name='bookinstance_branch_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-19 09:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='catalog.book')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.book')),
+            ],
+            options={
+                'ordering': ['book', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='bookrecommendation',
+            constraint=models.UniqueConstraint(models.F('book'), models.F('rank'), name='bookrecommendation_rank_unique'),
+        ),
+    ]
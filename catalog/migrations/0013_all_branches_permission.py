@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-19 10:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0012_bookinstance_borrower_single_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='bookinstance',
+            options={'ordering': ['due_back'], 'permissions': [('can_mark_returned', 'Set book as returned'), ('can_view_all_branches', 'See copies at every branch')]},
+        ),
+    ]
@@ -1,10 +1,36 @@
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.db.models import UniqueConstraint
 from django.db.models.functions import Lower
 from django.contrib.auth.models import User
-import uuid
+from django.core.exceptions import ValidationError
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
 from datetime import date
+from .ids import new_bookinstance_id
+from .isbn import normalize as normalize_isbn, validate_isbn
+
+
+class LoadedValuesMixin:
+    """
+    Remembers the field values an instance was loaded or last saved with,
+    so changes can be told apart without reading the row again.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        deferred = self.get_deferred_fields()
+        saved = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+                 if field.attname not in deferred and (update_fields is None or field.name in update_fields)}
+        self._loaded_values = {**getattr(self, "_loaded_values", {}), **saved}
 
 
 class Genre(models.Model):
@@ -35,7 +61,7 @@ class Genre(models.Model):
                              )]
 
 
-class Author(models.Model):
+class Author(LoadedValuesMixin, models.Model):
     first_name = models.CharField(
         max_length=100, help_text="Enter first name of author of book")
     last_name = models.CharField(
@@ -86,13 +112,15 @@ class Language(models.Model):
                              )]
 
 
-class Book(models.Model):
+class Book(LoadedValuesMixin, models.Model):
 
     title = models.CharField(max_length=120, help_text="Title of the book")
     summary = models.TextField(
         max_length=1000, help_text="Type the descripion of the book")
-    isbn = models.CharField('ISBN', max_length=13,
-                            unique=True, help_text="Enter the isbn of the book")
+    isbn = models.CharField('ISBN', max_length=17, unique=True, validators=[validate_isbn],
+                            help_text="Enter the ISBN-10 or ISBN-13 of the book, hyphens allowed")
+    isbn13 = models.CharField('ISBN-13', max_length=13, unique=True, null=True, editable=False,
+                              help_text="Normalized ISBN-13 used for lookups")
     author = models.ManyToManyField(
         Author, help_text="Enter the autor(-s) of the book")
     genre = models.ManyToManyField(
@@ -106,6 +134,27 @@ class Book(models.Model):
         """
         return self.title
 
+    def clean(self):
+        """
+        Rejects an ISBN that another book already has, however either is written.
+        """
+        try:
+            isbn13 = normalize_isbn(self.isbn)
+        except ValueError:
+            return
+        if Book.objects.filter(isbn13=isbn13).exclude(pk=self.pk).exists():
+            raise ValidationError({"isbn": "A book with this ISBN already exists."})
+
+    def save(self, *args, **kwargs):
+        """
+        Keeps the normalized ISBN-13 in step with the ISBN as entered.
+        """
+        try:
+            self.isbn13 = normalize_isbn(self.isbn)
+        except ValueError:
+            self.isbn13 = None
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         """
         Returns the url to access a particular book instance.
@@ -130,13 +179,58 @@ class Book(models.Model):
         ordering = ["title"]
 
 
-class BookInstance(models.Model):
+class Branch(models.Model):
+    """
+    A library branch holding copies of books.
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Enter the name of the branch")
+    librarians = models.ManyToManyField(User, blank=True, related_name="library_branches",
+                                        help_text="Librarians who manage this branch's loans")
+
+    def __str__(self):
+        """
+        String representing the branch
+        """
+        return self.name
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name_plural = "branches"
+
+
+class BookInstanceQuerySet(models.QuerySet):
+    """
+    Branch-scoped queries; filtering on branch and status first keeps them on the
+    (branch, status, due_back) index.
+    """
+
+    def at_branches(self, branch_ids):
+        return self.filter(branch_id__in=branch_ids)
+
+    def for_librarian(self, user):
+        """
+        Copies at the user's branches; every copy only for superusers and
+        holders of can_view_all_branches, none for users without a branch.
+        """
+        if user.has_perm("catalog.can_view_all_branches"):
+            return self
+        branch_ids = list(user.library_branches.values_list("pk", flat=True))
+        return self.at_branches(branch_ids) if branch_ids else self.none()
+
+    def on_loan(self):
+        return self.filter(status="o")
+
+    def available(self):
+        return self.filter(status="a")
+
+
+class BookInstance(LoadedValuesMixin, models.Model):
     """
     Model representing a specific copy of a book
     """
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=new_bookinstance_id,
         help_text="Unique ID for this particular book across whole library"
     )
 
@@ -155,7 +249,39 @@ class BookInstance(models.Model):
         default="m",
         help_text="Book Availability"
     )
-    borrower = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # Indexed by bookinstance_borrower_idx, which leads with the borrower.
+    borrower = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
+    # Indexed by bookinstance_branch_idx, which leads with the branch.
+    branch = models.ForeignKey(Branch, on_delete=models.PROTECT, null=True, blank=True, db_index=False)
+
+    objects = BookInstanceQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the copy and keeps the loan history in step: a loan is appended
+        when the copy is checked out, stamped when it comes back and given
+        the new due date when it is renewed.
+        """
+        loaded = getattr(self, "_loaded_values", {})
+        tracked = ["status", "borrower_id", "due_back"]
+        if not self._state.adding and any(name not in loaded for name in tracked):
+            # Deferred when loaded; "not loaded" must not read as "not on loan".
+            loaded = {**loaded, **(BookInstance.objects.filter(pk=self.pk).values(*tracked).first() or {})}
+        was_status, was_borrower_id = loaded.get("status"), loaded.get("borrower_id")
+        was_on_loan = was_status == "o"
+        is_on_loan = self.status == "o"
+        borrower_changed = was_borrower_id != self.borrower_id
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if was_on_loan and (not is_on_loan or borrower_changed):
+                Loan.objects.filter(copy=self, returned__isnull=True).update(returned=date.today())
+            elif was_on_loan and loaded.get("due_back") != self.due_back:
+                Loan.objects.filter(copy=self, returned__isnull=True).update(due_back=self.due_back)
+            if is_on_loan and (not was_on_loan or borrower_changed):
+                from .jobs import enqueue
+                loan = Loan.objects.create(copy=self, book_id=self.book_id, borrower_id=self.borrower_id,
+                                           due_back=self.due_back)
+                enqueue("record_checkout", book_id=self.book_id, day=loan.checked_out.isoformat())
 
     def __str__(self):
         """
@@ -178,4 +304,201 @@ class BookInstance(models.Model):
     class Meta:
 
         ordering = ["due_back"]
-        permissions = [("can_mark_returned", "Set book as returned")]
+        permissions = [
+            ("can_mark_returned", "Set book as returned"),
+            ("can_view_all_branches", "See copies at every branch"),
+        ]
+        indexes = [
+            models.Index(fields=["borrower", "status", "due_back"], name="bookinstance_borrower_idx"),
+            models.Index(fields=["branch", "status", "due_back"], name="bookinstance_branch_idx"),
+        ]
+
+
+class LoanBase(models.Model):
+    """
+    Fields shared by the live loan history and its archive.
+    """
+    copy = models.ForeignKey(BookInstance, on_delete=models.SET_NULL, null=True, related_name="+")
+    book = models.ForeignKey(Book, on_delete=models.SET_NULL, null=True, related_name="+")
+    borrower = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="+")
+    checked_out = models.DateField(default=date.today)
+    due_back = models.DateField(null=True, blank=True)
+    returned = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        """
+        String representing the loan
+        """
+        return f"{self.copy_id} -> {self.borrower_id} ({self.checked_out})"
+
+    class Meta:
+        abstract = True
+        ordering = ["-checked_out"]
+
+
+class Loan(LoanBase):
+    """
+    One checkout of a copy, appended when the copy goes on loan and stamped when it comes back.
+    """
+
+    class Meta(LoanBase.Meta):
+        indexes = [
+            models.Index(fields=["borrower", "-checked_out"], name="loan_borrower_idx"),
+            models.Index(fields=["copy", "returned"], name="loan_copy_open_idx"),
+            models.Index(fields=["returned"], name="loan_returned_idx"),
+        ]
+
+
+class LoanArchive(LoanBase):
+    """
+    Returned loans moved out of the live table by the archive_loans command.
+    """
+    archived = models.DateField(default=date.today)
+
+    class Meta(LoanBase.Meta):
+        indexes = [
+            models.Index(fields=["borrower", "-checked_out"], name="loanarchive_borrower_idx"),
+        ]
+
+
+class CirculationBase(models.Model):
+    """
+    Number of checkouts on one day, kept up to date by catalog.stats.
+    """
+    day = models.DateField()
+    loans = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ["-day"]
+
+
+class BookCirculation(CirculationBase):
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+
+    class Meta(CirculationBase.Meta):
+        constraints = [UniqueConstraint("book", "day", name="bookcirculation_book_day_unique")]
+        indexes = [models.Index(fields=["day", "book"], name="bookcirculation_day_idx")]
+
+
+class GenreCirculation(CirculationBase):
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name="+")
+
+    class Meta(CirculationBase.Meta):
+        constraints = [UniqueConstraint("genre", "day", name="genrecirculation_genre_day_unique")]
+        indexes = [models.Index(fields=["day", "genre"], name="genrecirculation_day_idx")]
+
+
+class AuthorCirculation(CirculationBase):
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="+")
+
+    class Meta(CirculationBase.Meta):
+        constraints = [UniqueConstraint("author", "day", name="authorcirculation_author_day_unique")]
+        indexes = [models.Index(fields=["day", "author"], name="authorcirculation_day_idx")]
+
+
+class BookRecommendation(models.Model):
+    """
+    One "readers also borrowed" neighbour of a book, written by build_recommendations.
+    """
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="recommendations")
+    recommended = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        """
+        String representing the recommendation
+        """
+        return f"{self.book_id} -> {self.recommended_id} (#{self.rank})"
+
+    class Meta:
+        ordering = ["book", "rank"]
+        # Also the index behind book.recommendations, read in rank order.
+        constraints = [UniqueConstraint("book", "rank", name="bookrecommendation_rank_unique")]
+
+
+class Job(models.Model):
+    """
+    A unit of background work, claimed and run by the run_worker command.
+
+    A claimed job stays "running" with run_after pushed forward by the lease,
+    so a job whose worker died becomes claimable again once the lease ends.
+    Finished jobs are deleted; failed ones are kept for inspection.
+    """
+    STATUS = [
+        ('q', 'Queued'),
+        ('r', 'Running'),
+        ('f', 'Failed'),
+    ]
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=1, choices=STATUS, default="q")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """
+        String representing the job
+        """
+        return f"{self.task} ({self.get_status_display()})"
+
+    class Meta:
+        ordering = ["run_after"]
+        indexes = [models.Index(fields=["status", "run_after"], name="job_claim_idx")]
+
+
+class PageHit(models.Model):
+    """
+    Visits of one detail page, flushed in batches by catalog.hits.
+    """
+    url_name = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    hits = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        """
+        String representing the page hits
+        """
+        return f"{self.url_name} {self.object_id}: {self.hits}"
+
+    class Meta:
+        constraints = [UniqueConstraint("url_name", "object_id", name="pagehit_page_unique")]
+        indexes = [models.Index(fields=["url_name", "-hits"], name="pagehit_most_visited_idx")]
+
+
+class AuditLog(models.Model):
+    """
+    One change to a catalog object, written in batches by catalog.audit.
+
+    ``changes`` maps each changed field to ``[old, new]``; many-to-many
+    fields map to ``{"added": [...], "removed": [...]}`` instead.
+    """
+    ACTIONS = [
+        ('c', 'Created'),
+        ('u', 'Changed'),
+        ('d', 'Deleted'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    action = models.CharField(max_length=1, choices=ACTIONS)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=64)
+    object_repr = models.CharField(max_length=200)
+    changes = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        """
+        String representing the audit entry
+        """
+        return f"{self.get_action_display()} {self.object_repr} ({self.timestamp:%Y-%m-%d %H:%M})"
+
+    class Meta:
+        ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["content_type", "object_id", "-timestamp"], name="auditlog_object_idx"),
+            models.Index(fields=["user", "-timestamp"], name="auditlog_user_idx"),
+        ]
@@ -0,0 +1,111 @@
+"""
+"Readers also borrowed" scores, computed offline by build_recommendations.
+
+Books are rows 0..n-1 of integer arrays, and every step below is a
+vectorized NumPy operation over (book, book) pairs; no Python loop runs per
+loan or per pair. Candidates are pairs of books borrowed by the same reader
+or written by the same author. Each candidate is scored by:
+
+    cosine(co-borrowers) + author_weight * Jaccard(authors)
+                         + genre_weight * Jaccard(genres)
+
+Genre overlap only re-ranks candidates. Pairing every book of a genre would
+be quadratic in the size of the catalog.
+
+Only the build_recommendations command imports this module, so the web
+processes never load NumPy.
+"""
+import numpy as np
+
+# Set bits in each byte value, for counting shared genres in packed rows.
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+
+def shared_pairs(groups, items, n_items, max_group):
+    """
+    Counts, for each ordered pair of distinct items, the groups they share.
+
+    ``groups`` and ``items`` are parallel arrays of distinct (group, item)
+    memberships. Groups larger than ``max_group`` are skipped; they would add
+    max_group² pairs for little signal. Returns the ``(a, b, count)`` arrays.
+    """
+    order = np.lexsort((items, groups))
+    groups, items = groups[order], items[order]
+    _, starts, sizes = np.unique(groups, return_index=True, return_counts=True)
+    keep = (sizes > 1) & (sizes <= max_group)
+    starts, sizes = starts[keep], sizes[keep]
+    if not len(sizes):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    # Position of every member of a kept group, and its group's start and size.
+    member_sizes = np.repeat(sizes, sizes)
+    member_starts = np.repeat(starts, sizes)
+    members = member_starts + _ranks(sizes)
+    # Every member paired with every member of its group, itself included.
+    left = np.repeat(members, member_sizes)
+    right = np.repeat(member_starts, member_sizes) + _ranks(member_sizes)
+
+    a, b = items[left], items[right]
+    distinct = a != b
+    keys, counts = np.unique(a[distinct] * n_items + b[distinct], return_counts=True)
+    return keys // n_items, keys % n_items, counts
+
+
+def _ranks(sizes):
+    """
+    0..size-1 for each size, concatenated.
+    """
+    return np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+
+def _jaccard(a, b, shared, totals):
+    union = totals[a] + totals[b] - shared
+    return np.divide(shared, union, out=np.zeros(len(a)), where=union > 0)
+
+
+def build(n_books, loans, authorship, genres, top_k=10, author_weight=0.5, genre_weight=0.25,
+          max_group=500, chunk_size=1_000_000):
+    """
+    Top ``top_k`` neighbours of every book.
+
+    ``loans`` holds distinct (borrower, book) rows, ``authorship`` (author,
+    book) rows and ``genres`` (book, genre) rows, with books numbered
+    0..n_books-1. Returns the ``(book, recommended, score, rank)`` arrays.
+    """
+    n = np.int64(n_books)
+    borrowers = np.bincount(loans[:, 1], minlength=n_books)
+    a, b, co = shared_pairs(loans[:, 0], loans[:, 1], n, max_group)
+    borrowed_keys = a * n + b
+    cosine = co / np.sqrt(borrowers[a] * borrowers[b])
+
+    authors = np.bincount(authorship[:, 1], minlength=n_books)
+    a, b, shared = shared_pairs(authorship[:, 0], authorship[:, 1], n, max_group)
+    authored_keys = a * n + b
+    author_overlap = _jaccard(a, b, shared, authors)
+
+    keys = np.union1d(borrowed_keys, authored_keys)
+    scores = np.zeros(len(keys))
+    scores[np.searchsorted(keys, borrowed_keys)] += cosine
+    scores[np.searchsorted(keys, authored_keys)] += author_weight * author_overlap
+    a, b = keys // n, keys % n
+
+    if len(genres) and genre_weight:
+        # One bit per genre, so the genres two books share are an AND and a popcount.
+        genre_index = np.unique(genres[:, 1], return_inverse=True)[1]
+        matrix = np.zeros((n_books, genre_index.max() + 1), dtype=bool)
+        matrix[genres[:, 0], genre_index] = True
+        packed = np.packbits(matrix, axis=1)
+        totals = matrix.sum(axis=1)
+        for start in range(0, len(keys), chunk_size):
+            part = slice(start, start + chunk_size)
+            common = POPCOUNT[packed[a[part]] & packed[b[part]]].sum(axis=1)
+            scores[part] += genre_weight * _jaccard(a[part], b[part], common, totals)
+
+    # Best first within each book, ties broken by the lower book number.
+    order = np.lexsort((b, -scores, a))
+    a, b, scores = a[order], b[order], scores[order]
+    first = np.flatnonzero(np.r_[True, a[1:] != a[:-1]]) if len(a) else np.empty(0, dtype=np.int64)
+    rank = _ranks(np.diff(np.r_[first, len(a)]))
+    top = rank < top_k
+    return a[top], b[top], scores[top], rank[top]
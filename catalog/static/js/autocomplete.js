@@ -0,0 +1,36 @@
+// Turns <select data-autocomplete-url> widgets into search-as-you-type pickers.
+// Selected options stay in the select; matches from the server are added as
+// options next to them while the rest of the table is never sent to the page.
+document.querySelectorAll("select[data-autocomplete-url]").forEach(function (select) {
+  var search = document.createElement("input");
+  search.type = "search";
+  search.className = "form-control";
+  search.placeholder = "Type to search...";
+  select.parentNode.insertBefore(search, select);
+
+  var timer = null;
+  search.addEventListener("input", function () {
+    clearTimeout(timer);
+    timer = setTimeout(function () {
+      var query = search.value.trim();
+      if (!query) {
+        return;
+      }
+      fetch(select.dataset.autocompleteUrl + "?q=" + encodeURIComponent(query))
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          Array.from(select.options).forEach(function (option) {
+            if (option.value && !option.selected) {
+              option.remove();
+            }
+          });
+          var present = new Set(Array.from(select.options).map(function (option) { return option.value; }));
+          data.results.forEach(function (result) {
+            if (!present.has(String(result.id))) {
+              select.add(new Option(result.text, result.id));
+            }
+          });
+        });
+    }, 200);
+  });
+});
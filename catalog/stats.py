@@ -0,0 +1,54 @@
+"""
+Circulation statistics.
+
+Daily checkout counts per book, genre and author are kept in rollup tables
+that are incremented on every checkout, so the home page reads a handful of
+small rows instead of aggregating the whole loan history on each request.
+"""
+from datetime import date, timedelta
+
+from django.db.models import F, Sum
+
+from .models import AuthorCirculation, Book, BookCirculation, GenreCirculation
+
+
+def _increment(model, key, ids, day):
+    """
+    Adds one checkout for each of ``ids`` on ``day``, creating missing rows first.
+    """
+    if not ids:
+        return
+    model.objects.bulk_create([model(**{key: pk}, day=day, loans=0) for pk in ids], ignore_conflicts=True)
+    model.objects.filter(**{f"{key}__in": ids}, day=day).update(loans=F("loans") + 1)
+
+
+def record_checkout(book_id, day=None):
+    """
+    Counts one checkout of the book in every rollup.
+    """
+    day = day or date.today()
+    genre_ids = list(Book.genre.through.objects.filter(book_id=book_id).values_list("genre_id", flat=True))
+    author_ids = list(Book.author.through.objects.filter(book_id=book_id).values_list("author_id", flat=True))
+    _increment(BookCirculation, "book_id", [book_id], day)
+    _increment(GenreCirculation, "genre_id", genre_ids, day)
+    _increment(AuthorCirculation, "author_id", author_ids, day)
+
+
+def _top(model, key, label_fields, days, limit):
+    since = date.today() - timedelta(days=days)
+    return list(model.objects.filter(day__gte=since)
+                .values(key, *label_fields)
+                .annotate(total=Sum("loans"))
+                .order_by("-total", key)[:limit])
+
+
+def most_borrowed_books(days=30, limit=5):
+    return _top(BookCirculation, "book_id", ["book__title"], days, limit)
+
+
+def most_active_genres(days=30, limit=5):
+    return _top(GenreCirculation, "genre_id", ["genre__name"], days, limit)
+
+
+def most_active_authors(days=30, limit=5):
+    return _top(AuthorCirculation, "author_id", ["author__first_name", "author__last_name"], days, limit)
@@ -0,0 +1,43 @@
+"""
+Background tasks, see catalog.jobs.
+"""
+import base64
+from datetime import date
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management import call_command
+
+from . import hits as hits_module, stats
+from .jobs import task
+
+
+@task("send_email")
+def send_email(subject, body, from_email, to, cc=(), bcc=(), reply_to=(), headers=None, alternatives=(),
+               attachments=()):
+    message = EmailMultiAlternatives(subject, body, from_email, to, bcc=bcc, cc=cc, reply_to=reply_to,
+                                     headers=headers, alternatives=[tuple(a) for a in alternatives],
+                                     connection=get_connection(settings.JOBS_EMAIL_BACKEND))
+    for filename, content, mimetype in attachments:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    message.send()
+
+
+@task("record_checkout")
+def record_checkout(book_id, day):
+    stats.record_checkout(book_id, date.fromisoformat(day))
+
+
+@task("rebuild_stats")
+def rebuild_stats():
+    call_command("rebuild_stats", verbosity=0)
+
+
+@task("record_hits")
+def record_hits(hits):
+    hits_module.save_hits(hits)
+
+
+@task("warm_cache")
+def warm_cache(**options):
+    call_command("warm_cache", verbosity=0, **options)
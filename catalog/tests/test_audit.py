@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User, Permission
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from catalog import audit
+from catalog.models import AuditLog, Author, Book, BookInstance
+
+
+class AuditLogTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.librarian = User.objects.create_user(username="librarian", password="12345")
+        cls.librarian.user_permissions.add(Permission.objects.get(name="Set book as returned"))
+        cls.author = Author.objects.create(first_name="Isaac", last_name="Asimov")
+        cls.book = Book.objects.create(title="Foundation", summary="Psychohistory", isbn="9780553293357")
+
+    def test_records_changed_fields_only(self):
+        author = Author.objects.get(pk=self.author.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            author.last_name = "Azimov"
+            author.save()
+            author.save()
+        entry = AuditLog.objects.get()
+        self.assertEqual(entry.action, "u")
+        self.assertEqual(entry.object_id, str(author.pk))
+        self.assertEqual(entry.changes, {"last_name": ["Asimov", "Azimov"]})
+
+    def test_records_create_and_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            copy = BookInstance.objects.create(book=self.book, status="a")
+            copy.delete()
+        created, deleted = AuditLog.objects.order_by("pk")
+        self.assertEqual(created.action, "c")
+        self.assertEqual(created.changes["status"], [None, "a"])
+        self.assertEqual(deleted.action, "d")
+        self.assertEqual(deleted.object_id, created.object_id)
+
+    def test_records_relation_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.author.add(self.author)
+            self.book.author.clear()
+        added, removed = AuditLog.objects.order_by("pk")
+        self.assertEqual(added.changes, {"author": {"added": [self.author.pk]}})
+        self.assertEqual(removed.changes, {"author": {"removed": [self.author.pk]}})
+
+    def test_rolled_back_change_is_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Author.objects.create(first_name="Arthur", last_name="Clarke")
+                raise RuntimeError
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_buffer_is_written_at_the_end_in_one_query(self):
+        with audit.buffered(self.librarian):
+            with self.captureOnCommitCallbacks(execute=True):
+                for name in ["Clarke", "Herbert", "Le Guin"]:
+                    Author.objects.create(first_name="A", last_name=name)
+            self.assertFalse(AuditLog.objects.exists())
+            with self.assertNumQueries(1):
+                audit.flush()
+        self.assertEqual(AuditLog.objects.filter(user=self.librarian).count(), 3)
+
+    @override_settings(AUDIT_FLUSH_EVERY=2)
+    def test_buffer_is_flushed_every_n_entries(self):
+        with audit.buffered():
+            with self.captureOnCommitCallbacks(execute=True):
+                for name in ["Clarke", "Herbert", "Le Guin"]:
+                    Author.objects.create(first_name="A", last_name=name)
+            self.assertEqual(AuditLog.objects.count(), 2)
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_edit_view_records_user(self):
+        self.client.login(username="librarian", password="12345")
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse("author-update", args=[self.author.pk]),
+                                    {"first_name": "Isaac", "last_name": "Asimov", "date_of_birth": "1920-01-02"})
+        self.assertEqual(resp.status_code, 302)
+        entry = AuditLog.objects.get()
+        self.assertEqual(entry.user, self.librarian)
+        self.assertEqual(entry.changes, {"date_of_birth": [None, "1920-01-02"]})
+
+    def test_edit_views_require_permission(self):
+        User.objects.create_user(username="reader", password="12345")
+        self.client.login(username="reader", password="12345")
+        for name in ["author-update", "author-delete"]:
+            self.assertEqual(self.client.get(reverse(name, args=[self.author.pk])).status_code, 403)
+        for name in ["book-update", "book-delete"]:
+            self.assertEqual(self.client.get(reverse(name, args=[self.book.pk])).status_code, 403)
+        self.assertEqual(self.client.get(reverse("book-create")).status_code, 403)
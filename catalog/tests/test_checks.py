@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase, override_settings
+from catalog import checks
+
+
+class PerformanceChecksTest(SimpleTestCase):
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_db_sessions_warn(self):
+        self.assertEqual([e.id for e in checks.check_session_engine(None)], ["catalog.W002"])
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+                       CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                                           "LOCATION": "/tmp/locallibrary-check"}})
+    def test_cached_sessions_pass(self):
+        self.assertEqual(checks.check_session_engine(None), [])
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+                       CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_sessions_in_per_process_cache_warn(self):
+        self.assertEqual([e.id for e in checks.check_session_engine(None)], ["catalog.W002"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+    def test_dummy_cache_warns(self):
+        self.assertEqual([e.id for e in checks.check_cache_backend(None)], ["catalog.W001"])
+
+    @override_settings(DEBUG=False, TEMPLATES=[{
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {"loaders": ["django.template.loaders.app_directories.Loader"]},
+    }])
+    def test_uncached_template_loader_warns(self):
+        self.assertEqual([e.id for e in checks.check_template_loaders(None)], ["catalog.W003"])
+
+    @override_settings(DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "CONN_MAX_AGE": 600}})
+    def test_persistent_connections_without_health_checks_warn(self):
+        self.assertEqual([e.id for e in checks.check_persistent_connections(None)], ["catalog.W005"])
+
+    @override_settings(MIDDLEWARE=["django.middleware.gzip.GZipMiddleware"])
+    def test_gzip_middleware_pass(self):
+        self.assertEqual(checks.check_gzip_middleware(None), [])
+
+    @override_settings(DETAIL_CACHE_TIMEOUT=600,
+                       CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_detail_cache_in_per_process_cache_warns(self):
+        self.assertEqual([e.id for e in checks.check_detail_cache(None)], ["catalog.W009"])
+
+    @override_settings(DETAIL_CACHE_TIMEOUT=0,
+                       CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_detail_cache_off_passes(self):
+        self.assertEqual(checks.check_detail_cache(None), [])
@@ -0,0 +1,131 @@
+from io import StringIO
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from catalog import hits
+from catalog.management.commands.build_recommendations import to_book_rows
+from catalog.management.commands.profile_imports import parse_importtime
+from catalog.models import (Author, Book, BookInstance, BookRecommendation, Branch, Genre, Language, Loan,
+                            LoanArchive, PageHit)
+
+
+class ProfileImportsCommandTest(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   _io\n"
+                  "import time:      2500 |       3100 | django.core.wsgi\n"
+                  "some warning\n")
+        rows = parse_importtime(output)
+        self.assertEqual([(120, 120, "   _io"), (2500, 3100, " django.core.wsgi")], rows)
+
+
+class WarmCacheCommandTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(first_name="David", last_name="One")
+        cls.book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="2079")
+        cls.book.author.set([cls.author])
+
+    def setUp(self):
+        cache.clear()
+        # Visits buffered by other tests' requests.
+        hits._pending.clear()
+
+    def test_detail_visits_are_counted(self):
+        for _ in range(3):
+            self.client.get(reverse("book-detail", args=[self.book.pk]))
+        hits.flush_pending()
+        self.assertEqual(hits.most_visited("book-detail", 10), [self.book.pk])
+        self.assertEqual(PageHit.objects.get(url_name="book-detail").hits, 3)
+
+    def test_missing_pages_are_not_counted(self):
+        for pk in [424242, 2 ** 70]:
+            self.assertEqual(self.client.get(reverse("book-detail", args=[pk])).status_code, 404)
+        hits.flush_pending()
+        self.assertFalse(PageHit.objects.exists())
+
+    def test_warms_most_visited_detail_fragments(self):
+        hits.save_hits([["book-detail", self.book.pk, 5], ["author-detail", self.author.pk, 2]])
+        book_key = make_template_fragment_key("book_detail", [self.book.pk])
+        out = StringIO()
+        call_command("warm_cache", concurrency=1, stdout=out, stderr=StringIO())
+        self.assertIn("Rendered 2 of 2 pages", out.getvalue())
+        self.assertIn("Cyberpunk", cache.get(book_key))
+        self.assertIsNotNone(cache.get(make_template_fragment_key("author_detail", [self.author.pk])))
+        hits.flush_pending()
+        self.assertEqual(PageHit.objects.get(url_name="book-detail").hits, 5)
+
+    def test_copy_change_invalidates_book_and_author_fragments(self):
+        self.client.get(reverse("book-detail", args=[self.book.pk]))
+        self.client.get(reverse("author-detail", args=[self.author.pk]))
+        BookInstance.objects.create(book=self.book, status="a")
+        self.assertIsNone(cache.get(make_template_fragment_key("book_detail", [self.book.pk])))
+        self.assertIsNone(cache.get(make_template_fragment_key("author_detail", [self.author.pk])))
+
+    def test_renaming_genre_language_or_branch_invalidates_book_fragment(self):
+        genre = Genre.objects.create(name="Science fiction")
+        language = Language.objects.create(name="English")
+        branch = Branch.objects.create(name="North")
+        self.book.genre.set([genre])
+        Book.objects.filter(pk=self.book.pk).update(language=language)
+        BookInstance.objects.create(book=self.book, status="a", branch=branch)
+        key = make_template_fragment_key("book_detail", [self.book.pk])
+        for obj in [genre, language, branch]:
+            self.client.get(reverse("book-detail", args=[self.book.pk]))
+            self.assertIsNotNone(cache.get(key))
+            obj.name += " (renamed)"
+            obj.save()
+            self.assertIsNone(cache.get(key))
+
+
+class BuildRecommendationsCommandTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(first_name="Isaac", last_name="Asimov")
+        genre = Genre.objects.create(name="Science fiction")
+        cls.books = {title: Book.objects.create(title=title, summary="-", isbn=title) for title in "ABCDE"}
+        cls.books["A"].author.set([author])
+        cls.books["D"].author.set([author])
+        for title in "AC":
+            cls.books[title].genre.set([genre])
+        readers = [User.objects.create_user(username=f"reader{i}", password="12345") for i in range(3)]
+        for reader, titles in zip(readers, ["AB", "AB", "AC"]):
+            for title in titles:
+                Loan.objects.create(book=cls.books[title], borrower=reader)
+        LoanArchive.objects.create(book=cls.books["A"], borrower=readers[0])
+
+    def recommended(self, title):
+        return [rec.recommended.title for rec in BookRecommendation.objects.filter(book=self.books[title])]
+
+    def test_ranks_co_borrowed_then_same_author_books(self):
+        call_command("build_recommendations", genre_weight=0, stdout=StringIO())
+        # cosine(A, B) = 2 / sqrt(3 * 2), cosine(A, C) = 1 / sqrt(3), D only shares the author.
+        self.assertEqual(self.recommended("A"), ["B", "C", "D"])
+        self.assertEqual(self.recommended("D"), ["A"])
+        self.assertEqual(self.recommended("E"), [])
+
+    def test_shared_genres_rerank_candidates(self):
+        call_command("build_recommendations", top_k=2, stdout=StringIO())
+        self.assertEqual(self.recommended("A"), ["C", "B"])
+
+    def test_rebuild_replaces_lists_and_book_page_shows_them(self):
+        self.client.get(self.books["B"].get_absolute_url())
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("build_recommendations", stdout=StringIO())
+        call_command("build_recommendations", stdout=StringIO())
+        self.assertEqual(self.recommended("B"), ["A"])
+        resp = self.client.get(self.books["B"].get_absolute_url())
+        self.assertContains(resp, "Readers also borrowed")
+        self.assertContains(resp, self.books["A"].get_absolute_url())
+
+    def test_books_added_during_the_build_are_skipped(self):
+        pairs = np.array([[1, 5], [2, 7], [3, 8], [4, 20]], dtype=np.int64)
+        rows = to_book_rows(pairs, 1, np.array([5, 7, 9], dtype=np.int64))
+        self.assertEqual(rows.tolist(), [[1, 0], [2, 1]])
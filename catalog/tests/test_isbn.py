@@ -0,0 +1,73 @@
+from django.contrib.auth.models import Permission, User
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from catalog.isbn import normalize, validate_isbn
+from catalog.models import Book, BookInstance
+
+
+class NormalizeIsbnTest(SimpleTestCase):
+
+    def test_isbn10_is_converted_to_isbn13(self):
+        self.assertEqual(normalize("0-306-40615-2"), "9780306406157")
+
+    def test_isbn10_with_x_check_digit(self):
+        self.assertEqual(normalize("0-8044-2957-x"), "9780804429573")
+
+    def test_isbn13_with_hyphens_and_spaces(self):
+        self.assertEqual(normalize("978-0-306 40615-7"), "9780306406157")
+
+    def test_bad_checksum(self):
+        with self.assertRaises(ValueError):
+            normalize("978-0-306-40615-8")
+        with self.assertRaises(ValidationError):
+            validate_isbn("0-306-40615-3")
+
+    def test_wrong_length(self):
+        with self.assertRaises(ValueError):
+            normalize("2079")
+
+
+class IsbnLookupViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="0-306-40615-2")
+        cls.available = BookInstance.objects.create(book=cls.book, status="a")
+        BookInstance.objects.create(book=cls.book, status="m")
+
+    def test_book_stores_normalized_isbn13(self):
+        self.assertEqual(self.book.isbn13, "9780306406157")
+
+    def test_lookup_by_any_form_in_one_query(self):
+        for code in ["9780306406157", "978-0-306-40615-7", "0306406152"]:
+            with self.assertNumQueries(1):
+                resp = self.client.get(reverse("isbn-lookup", args=[code]))
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()["book"]["id"], self.book.pk)
+            self.assertEqual(resp.json()["available_copies"], [str(self.available.id)])
+
+    def test_unknown_or_invalid_isbn(self):
+        self.assertEqual(self.client.get(reverse("isbn-lookup", args=["9780804429573"])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("isbn-lookup", args=["12345"])).status_code, 404)
+
+
+class BookIsbnUniquenessTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="0306406152")
+        cls.librarian = User.objects.create_user(username="librarian", password="12345")
+        cls.librarian.user_permissions.add(Permission.objects.get(name="Set book as returned"))
+
+    def test_duplicate_in_another_format_is_a_form_error(self):
+        self.client.login(username="librarian", password="12345")
+        resp = self.client.post(reverse("book-create"),
+                                {"title": "Copy", "summary": "-", "isbn": "978-0-306-40615-7"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertFormError(resp.context["form"], "isbn", "A book with this ISBN already exists.")
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_book_keeps_its_own_isbn_when_edited(self):
+        self.book.isbn = "978-0-306-40615-7"
+        self.book.clean()
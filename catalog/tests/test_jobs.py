@@ -0,0 +1,89 @@
+from io import StringIO
+import datetime
+from email.mime.text import MIMEText
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from catalog import jobs
+from catalog.models import Job
+
+
+calls = []
+
+
+@jobs.task("test_record")
+def record(value):
+    calls.append(value)
+
+
+@jobs.task("test_fail")
+def fail():
+    raise RuntimeError("boom")
+
+
+@override_settings(JOBS_RUN_INLINE=False)
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_and_deletes_jobs(self):
+        jobs.enqueue("test_record", value=1)
+        jobs.enqueue("test_record", value=2)
+        call_command("run_worker", burst=True, threads=1, stdout=StringIO())
+        self.assertEqual(sorted(calls), [1, 2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_with_backoff_then_failed(self):
+        job = jobs.enqueue("test_fail", max_attempts=2)
+        call_command("run_worker", burst=True, threads=1, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("q", 1))
+        self.assertTrue(job.run_after > timezone.now())
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        call_command("run_worker", burst=True, threads=1, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("f", 2))
+        self.assertIn("boom", job.last_error)
+
+    def test_claimed_job_is_not_claimed_again_until_lease_ends(self):
+        jobs.enqueue("test_record", value=1)
+        self.assertEqual(len(jobs.claim(10)), 1)
+        self.assertEqual(jobs.claim(10), [])
+        Job.objects.update(run_after=timezone.now()-datetime.timedelta(seconds=1))
+        self.assertEqual(len(jobs.claim(10)), 1)
+
+    @override_settings(EMAIL_BACKEND="catalog.mail.QueuedEmailBackend",
+                       JOBS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    def test_queued_email_is_sent_by_worker(self):
+        mail.send_mail("Overdue", "Please return the book", "library@example.com", ["reader@example.com"])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.get().task, "send_email")
+        call_command("run_worker", burst=True, threads=1, stdout=StringIO())
+        self.assertEqual(mail.outbox[0].subject, "Overdue")
+
+    @override_settings(EMAIL_BACKEND="catalog.mail.QueuedEmailBackend",
+                       JOBS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    def test_queued_email_keeps_attachments(self):
+        message = mail.EmailMessage("Receipt", "Attached", "library@example.com", ["reader@example.com"])
+        message.attach("receipt.pdf", b"%PDF-\x00\xff", "application/pdf")
+        message.attach("notes.txt", "Due in two weeks", "text/plain")
+        message.send()
+        call_command("run_worker", burst=True, threads=1, stdout=StringIO())
+        self.assertEqual(mail.outbox[0].attachments, [("receipt.pdf", b"%PDF-\x00\xff", "application/pdf"),
+                                                      ("notes.txt", "Due in two weeks", "text/plain")])
+
+    @override_settings(EMAIL_BACKEND="catalog.mail.QueuedEmailBackend",
+                       JOBS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    def test_email_with_mime_attachment_is_sent_at_once(self):
+        message = mail.EmailMessage("Receipt", "Attached", "library@example.com", ["reader@example.com"])
+        message.attach(MIMEText("Due in two weeks"))
+        message.send()
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_inline_mode_runs_immediately(self):
+        with override_settings(JOBS_RUN_INLINE=True):
+            self.assertIsNone(jobs.enqueue("test_record", value=3))
+        self.assertEqual(calls, [3])
@@ -0,0 +1,41 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from catalog import middleware
+
+
+class RateLimitMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.dict(middleware.rate_limits, {"books": (2, 60)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_over_limit_returns_429_before_any_query(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse("books")).status_code, 200)
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse("books"))
+        self.assertEqual(resp.status_code, 429)
+        self.assertTrue(int(resp["Retry-After"]) >= 1)
+
+    def test_buckets_are_per_ip(self):
+        for _ in range(3):
+            self.client.get(reverse("books"), REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(self.client.get(reverse("books"), REMOTE_ADDR="10.0.0.2").status_code, 200)
+
+    def test_unlimited_url_is_not_counted(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse("index")).status_code, 200)
+
+    @override_settings(RATELIMIT_ENABLE=False)
+    def test_disabled(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse("books")).status_code, 200)
+
+    @override_settings(RATELIMIT_PROXY_COUNT=1)
+    def test_client_ip_from_trusted_proxy(self):
+        request = mock.Mock(META={"HTTP_X_FORWARDED_FOR": "1.1.1.1, 2.2.2.2", "REMOTE_ADDR": "10.0.0.1"})
+        self.assertEqual(middleware.client_ip(request), "2.2.2.2")
@@ -1,5 +1,15 @@
-from django.test import TestCase
-from catalog.models import Author
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from catalog.models import (Author, Book, BookInstance, Genre, Loan, LoanArchive,
+                            AuthorCirculation, BookCirculation, GenreCirculation)
+from catalog import stats
+from catalog.ids import uuid7
+from io import StringIO
+from unittest import mock
+import datetime
+import time
+import uuid
 
 class AuthorModelTest(TestCase):
     
@@ -30,3 +40,99 @@ class AuthorModelTest(TestCase):
     def test_get_absolute_url(self):
         author = Author.objects.get(id=1)
         self.assertEquals(author.get_absolute_url(), "/catalog/author/1")
+
+
+class LoanHistoryTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader", password="12345")
+        cls.book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="2079")
+
+    def test_checkout_and_return_are_recorded(self):
+        copy = BookInstance.objects.create(book=self.book, status="a")
+        self.assertEqual(Loan.objects.count(), 0)
+        copy.status = "o"
+        copy.borrower = self.user
+        copy.due_back = datetime.date.today()+datetime.timedelta(weeks=3)
+        copy.save()
+        loan = Loan.objects.get()
+        self.assertEqual((loan.copy, loan.book, loan.borrower, loan.returned), (copy, self.book, self.user, None))
+        copy = BookInstance.objects.get(pk=copy.pk)
+        copy.status = "a"
+        copy.save()
+        self.assertEqual(Loan.objects.get().returned, datetime.date.today())
+
+    def test_renewal_does_not_add_a_loan(self):
+        copy = BookInstance.objects.create(book=self.book, status="o", borrower=self.user)
+        copy = BookInstance.objects.get(pk=copy.pk)
+        copy.due_back = datetime.date.today()+datetime.timedelta(weeks=1)
+        copy.save()
+        self.assertEqual(Loan.objects.count(), 1)
+        self.assertEqual(Loan.objects.get().due_back, copy.due_back)
+
+    def test_saving_copy_loaded_without_status_does_not_add_a_loan(self):
+        copy = BookInstance.objects.create(book=self.book, status="o", borrower=self.user)
+        copy = BookInstance.objects.only("id", "due_back").get(pk=copy.pk)
+        copy.due_back = datetime.date.today()+datetime.timedelta(weeks=2)
+        with mock.patch("catalog.jobs.enqueue") as enqueue:
+            copy.save()
+        self.assertEqual(Loan.objects.count(), 1)
+        self.assertEqual(Loan.objects.get().due_back, copy.due_back)
+        enqueue.assert_not_called()
+
+    def test_archive_moves_only_old_returned_loans(self):
+        copy = BookInstance.objects.create(book=self.book, status="a")
+        old = datetime.date.today()-datetime.timedelta(days=800)
+        Loan.objects.create(copy=copy, book=self.book, borrower=self.user, checked_out=old, returned=old)
+        Loan.objects.create(copy=copy, book=self.book, borrower=self.user)
+        call_command("archive_loans", months=12, batch_size=1, stdout=StringIO())
+        self.assertEqual(Loan.objects.count(), 1)
+        self.assertEqual(LoanArchive.objects.get().returned, old)
+
+
+class CirculationStatsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="reader", password="12345")
+        cls.author = Author.objects.create(first_name="David", last_name="One")
+        cls.genre = Genre.objects.create(name="Science fiction")
+        cls.book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="2079")
+        cls.book.author.set([cls.author])
+        cls.book.genre.set([cls.genre])
+
+    def test_checkouts_update_rollups(self):
+        for _ in range(2):
+            BookInstance.objects.create(book=self.book, status="o", borrower=self.user)
+        today = datetime.date.today()
+        self.assertEqual(BookCirculation.objects.get(book=self.book, day=today).loans, 2)
+        self.assertEqual(GenreCirculation.objects.get(genre=self.genre, day=today).loans, 2)
+        self.assertEqual(AuthorCirculation.objects.get(author=self.author, day=today).loans, 2)
+        self.assertEqual(stats.most_borrowed_books()[0]["total"], 2)
+
+    def test_rebuild_matches_incremental_counts(self):
+        BookInstance.objects.create(book=self.book, status="o", borrower=self.user)
+        old = datetime.date.today()-datetime.timedelta(days=3)
+        LoanArchive.objects.create(book=self.book, borrower=self.user, checked_out=old, returned=old)
+        BookCirculation.objects.all().delete()
+        call_command("rebuild_stats", stdout=StringIO())
+        self.assertEqual(sorted(BookCirculation.objects.values_list("day", "loans")),
+                         [(old, 1), (datetime.date.today(), 1)])
+        self.assertEqual(AuthorCirculation.objects.count(), 2)
+
+
+class BookInstanceIdTest(TestCase):
+
+    def test_uuid7_is_time_ordered(self):
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertEqual((first.version, first.variant), (7, uuid.RFC_4122))
+        self.assertLess(first.hex, second.hex)
+
+    def test_new_copies_get_time_ordered_ids(self):
+        book = Book.objects.create(title="Cyberpunk", summary="2077", isbn="2079")
+        self.assertEqual(BookInstance.objects.create(book=book).id.version, 7)
+        with override_settings(CATALOG_TIME_ORDERED_IDS=False):
+            self.assertEqual(BookInstance.objects.create(book=book).id.version, 4)
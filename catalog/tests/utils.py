@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+from unittest import mock
+
+from django.db.models import Model
+
+
+@contextmanager
+def forbid_deferred_loading():
+    """
+    Fails when a field left out by only()/defer() is read, which costs one extra query per row.
+    """
+    refresh_from_db = Model.refresh_from_db
+
+    def refresh_deferred(instance, *args, **kwargs):
+        fields = kwargs.get("fields")
+        if fields:
+            raise AssertionError(
+                f"Deferred field(s) {', '.join(fields)} of {type(instance).__name__} were loaded one row at a time.")
+        return refresh_from_db(instance, *args, **kwargs)
+
+    with mock.patch.object(Model, "refresh_from_db", refresh_deferred):
+        yield
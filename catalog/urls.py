@@ -16,4 +16,16 @@ urlpatterns = [
     re_path(r"^book/create/$", views.BookCreate.as_view(), name = "book-create"),
     re_path(r"^book/(?P<pk>\d+)/update/$", views.BookUpdate.as_view(), name = "book-update"),
     re_path(r"^book/(?P<pk>\d+)/delete/$", views.BookDelete.as_view(), name = "book-delete"),
-]
\ No newline at end of file
+    re_path(r"^autocomplete/(?P<kind>\w+)/$", views.autocomplete, name = "autocomplete"),
+    re_path(r"^isbn/(?P<code>[-0-9Xx]+)/$", views.isbn_lookup, name = "isbn-lookup"),
+]
+
+# Requests allowed per client for a URL name, as (requests, window in seconds).
+# Checked by catalog.middleware.RateLimitMiddleware before any session or view work.
+rate_limits = {
+    "books": (60, 60),
+    "authors": (60, 60),
+    "login": (10, 60),
+    "password_reset": (5, 300),
+    "autocomplete": (300, 60),
+}
@@ -1,24 +1,36 @@
 import datetime
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.views import generic
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.urls import reverse, reverse_lazy
+from django.db.models import Count, FilteredRelation, Prefetch, Q
 from django.contrib.auth.decorators import permission_required
-from .forms import RenewBookForm
-from .models import Author, Genre, Book, BookInstance
+from .forms import BookForm, RenewBookForm
+from . import autocomplete as autocomplete_index, hits, isbn, stats
+from .models import Author, Genre, Book, BookInstance, Loan
 
 
 class BookListView (generic.ListView):
     paginate_by = 10
     model = Book
 
+    def get_queryset(self):
+        # book_list.html renders only the title and the author names.
+        return Book.objects.only("id", "title").prefetch_related(
+            Prefetch("author", queryset=Author.objects.only("id", "first_name", "last_name")))
+
 
 class AuthorListView (generic.ListView):
     paginate_by = 10
     model = Author
 
+    def get_queryset(self):
+        # author_list.html renders the name and the dates.
+        return Author.objects.only("id", "first_name", "last_name", "date_of_birth", "date_of_death")
+
 
 def index(request):
     """
@@ -38,14 +50,80 @@ def index(request):
                                                   "number_of_available_book_instances": number_of_available_book_instances,
                                                   "number_of_authors": number_of_authors,
                                                   "number_of_visits": number_of_visits,
+                                                  "most_borrowed_books": stats.most_borrowed_books(),
+                                                  "most_active_genres": stats.most_active_genres(),
+                                                  "most_active_authors": stats.most_active_authors(),
                                                   })
 
 
-class BookDetailView (generic.DetailView):
+def autocomplete(request, kind):
+    """
+    Prefix search over book titles, author names, genres and languages for autocomplete widgets.
+    """
+    if kind not in autocomplete_index.SOURCES:
+        raise Http404("Unknown autocomplete source")
+    query = request.GET.get("q", "").strip()
+    results = autocomplete_index.search(kind, query) if query else []
+    return JsonResponse({"results": results})
+
+
+def isbn_lookup(request, code):
+    """
+    Resolves a typed or scanned ISBN-10/13 to its book and available copies in one indexed query.
+    """
+    try:
+        isbn13 = isbn.normalize(code)
+    except ValueError:
+        raise Http404("Invalid ISBN")
+    rows = list(Book.objects.filter(isbn13=isbn13)
+                .annotate(available=FilteredRelation("bookinstance", condition=Q(bookinstance__status="a")))
+                .values_list("pk", "title", "available__id")
+                .order_by())
+    if not rows:
+        raise Http404("No book with this ISBN")
+    pk, title, _ = rows[0]
+    return JsonResponse({
+        "book": {"id": pk, "title": title, "isbn13": isbn13, "url": reverse("book-detail", args=[pk])},
+        "available_copies": [str(copy_id) for _, _, copy_id in rows if copy_id],
+    })
+
+
+class CachedDetailMixin:
+    """
+    Counts page visits for warm_cache and passes the fragment cache timeout to the template.
+    """
+
+    def get_object(self, queryset=None):
+        obj = super().get_object(queryset)
+        # Counted once the object exists, so missing ids never reach PageHit.
+        # Pages rendered by warm_cache bypass the URL resolver and are not counted.
+        if getattr(self.request, "resolver_match", None):
+            hits.record(self.request.resolver_match.url_name, obj.pk)
+        return obj
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["detail_cache_timeout"] = settings.DETAIL_CACHE_TIMEOUT
+        return context
+
+
+class BookDetailView (CachedDetailMixin, generic.DetailView):
     model = Book
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # All three are evaluated by the template only when the cached fragment is rebuilt.
+        context["copies"] = self.object.bookinstance_set.select_related("branch")
+        context["branch_availability"] = self.object.bookinstance_set.filter(branch__isnull=False) \
+            .values("branch__name") \
+            .annotate(available=Count("id", filter=Q(status="a")), total=Count("id")) \
+            .order_by("branch__name")
+        context["recommendations"] = self.object.recommendations.select_related("recommended") \
+            .only("book", "rank", "recommended__title")
+        return context
 
-class AuthorDetailView (generic.DetailView):
+
+class AuthorDetailView (CachedDetailMixin, generic.DetailView):
     model = Author
 
 
@@ -56,8 +134,15 @@ class LoanedBooksByUserListView (LoginRequiredMixin, generic.ListView):
     model = BookInstance
     template_name = 'catalog/bookinstance_list_borrowed_user.html'
     paginate_by = 10
+    loan_history_size = 10
     def get_queryset(self):
-        return BookInstance.objects.filter(borrower=self.request.user).filter(status__exact="o").order_by("due_back")
+        return BookInstance.objects.filter(borrower=self.request.user).filter(status__exact="o").select_related("book").order_by("due_back")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["loan_history"] = Loan.objects.filter(
+            borrower=self.request.user, returned__isnull=False).select_related("book")[:self.loan_history_size]
+        return context
 
 
 class LoanedBooksByAllUsersListView (PermissionRequiredMixin, generic.ListView):
@@ -69,7 +154,8 @@ class LoanedBooksByAllUsersListView (PermissionRequiredMixin, generic.ListView):
     paginate_by = 10
     permission_required = ('catalog.can_mark_returned')
     def get_queryset(self):
-        return BookInstance.objects.filter(status__exact="o").order_by("due_back")
+        return BookInstance.objects.for_librarian(self.request.user).on_loan() \
+            .select_related("book", "borrower").order_by("due_back")
 
 
 @permission_required('catalog.can_mark_returned')
@@ -95,31 +181,36 @@ class AuthorCreate(PermissionRequiredMixin, CreateView):
     permission_required = 'catalog.can_mark_returned'
 
 
-class AuthorUpdate(UpdateView):
+class AuthorUpdate(PermissionRequiredMixin, UpdateView):
 
     model = Author
     fields = ["first_name", "last_name", "date_of_birth", "date_of_death"]
-    
+    permission_required = 'catalog.can_mark_returned'
+
 
-class AuthorDelete(DeleteView):
+class AuthorDelete(PermissionRequiredMixin, DeleteView):
 
     model = Author
     success_url = reverse_lazy("authors")
+    permission_required = 'catalog.can_mark_returned'
 
 
-class BookCreate(CreateView):
+class BookCreate(PermissionRequiredMixin, CreateView):
 
     model = Book
-    fields = "__all__"
+    form_class = BookForm
+    permission_required = 'catalog.can_mark_returned'
 
 
-class BookUpdate(UpdateView):
+class BookUpdate(PermissionRequiredMixin, UpdateView):
 
     model = Book
-    fields = "__all__"
-    
+    form_class = BookForm
+    permission_required = 'catalog.can_mark_returned'
+
 
-class BookDelete(DeleteView):
+class BookDelete(PermissionRequiredMixin, DeleteView):
 
     model = Book
-    success_url = reverse_lazy("books")
\ No newline at end of file
+    success_url = reverse_lazy("books")
+    permission_required = 'catalog.can_mark_returned'
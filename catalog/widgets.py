@@ -0,0 +1,52 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """
+    Renders only the selected options; the rest are fetched from the
+    autocomplete endpoint as the user types, so the page does not carry an
+    <option> for every row of the related table.
+    """
+
+    class Media:
+        js = ["js/autocomplete.js"]
+
+    def __init__(self, kind, attrs=None, choices=()):
+        super().__init__(attrs, choices)
+        self.kind = kind
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse("autocomplete", args=[self.kind])
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        queryset = self.choices.queryset
+        selected = set()
+        for v in value:
+            if v in ("", None):
+                continue
+            try:
+                # Bound data is whatever was posted; the form reports values that are not pks.
+                selected.add(queryset.model._meta.pk.clean(v, None))
+            except ValidationError:
+                continue
+        options = []
+        if not self.allow_multiple_selected:
+            options.append(self.create_option(name, "", "---------", not selected, 0))
+        if selected:
+            field = self.choices.field
+            for obj in queryset.filter(pk__in=selected):
+                options.append(self.create_option(
+                    name, str(obj.pk), field.label_from_instance(obj), True, len(options)))
+        return [(None, options, 0)]
+
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    pass
@@ -0,0 +1,27 @@
+"""
+Settings package for locallibrary project.
+
+The profile is selected with the DJANGO_SETTINGS_PROFILE environment
+variable: "dev" (default), "prod" or "bench". DJANGO_SETTINGS_MODULE keeps
+pointing at "locallibrary.settings", so manage.py, wsgi.py and asgi.py do
+not need to know which profile is active. On Heroku set
+DJANGO_SETTINGS_PROFILE=prod as a config var so that collectstatic at build
+time and the release check see the production settings too.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+SETTINGS_PROFILE = os.environ.get('DJANGO_SETTINGS_PROFILE', 'dev')
+
+if SETTINGS_PROFILE == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif SETTINGS_PROFILE == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif SETTINGS_PROFILE == 'bench':
+    from .bench import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f"Unknown DJANGO_SETTINGS_PROFILE {SETTINGS_PROFILE!r}, "
+        "expected one of: dev, prod, bench")
@@ -1,7 +1,9 @@
 """
-Django settings for locallibrary project.
+Base Django settings for locallibrary project.
 
 Generated by 'django-admin startproject' using Django 5.0.3.
+Settings shared by every profile live here; the dev, prod and bench
+profiles in this package import them and override what differs.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/topics/settings/
@@ -17,7 +19,7 @@ from pathlib import Path
 LOGIN_REDIRECT_URL = '/'
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
 # Quick-start development settings - unsuitable for production
@@ -28,9 +30,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-kpj!s@tvmi9mdivwiedngnpg+2a4(*#l-!1#f0hzqwmuepu=b9')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = bool( os.environ.get('DJANGO_DEBUG', True) )
+DEBUG = os.environ.get('DJANGO_DEBUG', '').lower() in ('1', 'true', 'yes')
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -48,10 +50,12 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'catalog.middleware.RateLimitMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'catalog.middleware.AuditMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -133,11 +137,50 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 STATICFILES_DIRS = [BASE_DIR / 'templates/src']
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
-
 # Heroku: Update database configuration from $DATABASE_URL.
 import dj_database_url
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES['default'].update(db_from_env)
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
\ No newline at end of file
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Compile templates, URL patterns and model metadata when wsgi.py is imported.
+WARMUP_ON_STARTUP = False
+
+# Per-URL request limits are declared in catalog/urls.py (rate_limits).
+RATELIMIT_ENABLE = True
+RATELIMIT_CACHE = 'default'
+# Number of trusted proxies appending to X-Forwarded-For (0 uses REMOTE_ADDR).
+RATELIMIT_PROXY_COUNT = 0
+
+# Seconds before a process rebuilds its autocomplete index even without a
+# newer version in the cache, which a per-process cache never shows it.
+AUTOCOMPLETE_INDEX_MAX_AGE = 60
+
+# Background jobs (catalog.jobs). Inline mode runs tasks inside enqueue().
+JOBS_RUN_INLINE = True
+JOBS_RETRY_BASE_DELAY = 10
+JOBS_RETRY_MAX_DELAY = 3600
+# Backend the send_email task delivers with when EMAIL_BACKEND queues messages.
+JOBS_EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+# Seconds the book and author detail fragments stay cached (catalog.caching);
+# 0 turns fragment caching off. Needs a cache shared by all processes.
+DETAIL_CACHE_TIMEOUT = 600
+# Visits counted in memory before they are handed to the job queue (catalog.hits).
+HIT_FLUSH_EVERY = 100
+HIT_FLUSH_INTERVAL = 60
+
+# New BookInstance ids are time-ordered UUID7 instead of random UUID4 (catalog.ids).
+# Existing ids are kept as they are, so both kinds coexist.
+CATALOG_TIME_ORDERED_IDS = True
+
+# Audit entries buffered per request before they are written (catalog.audit).
+AUDIT_FLUSH_EVERY = 50
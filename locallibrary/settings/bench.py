@@ -0,0 +1,29 @@
+"""
+Benchmark settings: the production profile, runnable on a local machine.
+
+Keeps the production request path but drops what a benchmark machine cannot
+provide (a secret key in the environment, collected static files) and uses
+a fast password hasher so seeding test users does not dominate run time.
+"""
+
+import os
+
+os.environ.setdefault('DJANGO_SECRET_KEY', 'django-insecure-bench-only')
+
+from .prod import *  # noqa: E402,F401,F403
+
+ALLOWED_HOSTS = ['*']
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Benchmarks drive many requests from one address.
+RATELIMIT_ENABLE = False
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage',
+    },
+}
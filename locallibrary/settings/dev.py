@@ -0,0 +1,10 @@
+"""
+Development settings: debug on, console email, no static manifest.
+"""
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+JOBS_EMAIL_BACKEND = EMAIL_BACKEND
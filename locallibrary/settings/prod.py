@@ -0,0 +1,98 @@
+"""
+Production settings.
+
+Everything that sits on the request path is tuned here: a real cache
+backend, cached sessions, the cached template loader, persistent checked
+database connections, compressed static files and gzip responses.
+Run ``python manage.py check --deploy --tag performance --fail-level WARNING``
+to verify that none of these were switched back to a slow path.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured(
+        "DJANGO_SECRET_KEY must be set in the environment for the prod profile") from None
+
+# Cache: Redis when REDIS_URL is set (needs the "redis" package), a shared
+# file-based cache when DJANGO_CACHE_DIR is set, per-process memory otherwise.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif os.environ.get('DJANGO_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['DJANGO_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'locallibrary',
+        }
+    }
+    # Each worker would keep its own copy of a fragment that only the worker
+    # making a change invalidates, so detail pages are not cached here.
+    DETAIL_CACHE_TIMEOUT = 0
+
+# Sessions are read from the cache and only written through to the database
+# when every worker shares that cache. A per-process cache would keep a
+# logged-out session alive in the other workers, so they stay in the database.
+if CACHES['default']['BACKEND'].endswith('.LocMemCache'):
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Compile every template once per process instead of on each render.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Reuse database connections between requests and drop broken ones early.
+DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DJANGO_CONN_MAX_AGE', 600))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# GZip right after WhiteNoise, which serves its own pre-compressed files.
+MIDDLEWARE = list(MIDDLEWARE)
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware') + 1,
+    'django.middleware.gzip.GZipMiddleware')
+
+# Heroku's router is the one proxy in front of the dynos.
+RATELIMIT_PROXY_COUNT = int(os.environ.get('DJANGO_RATELIMIT_PROXY_COUNT', 1))
+
+# Slow side effects (email, statistics) go through the job queue;
+# run the worker process from the Procfile.
+JOBS_RUN_INLINE = False
+EMAIL_BACKEND = 'catalog.mail.QueuedEmailBackend'
+
+# Do the per-process startup work before gunicorn forks (see gunicorn.conf.py).
+WARMUP_ON_STARTUP = True
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
@@ -0,0 +1,81 @@
+"""
+Pre-fork warmup for locallibrary project.
+
+Everything done here would otherwise happen lazily on the first requests
+served by each gunicorn worker. With ``preload_app`` it runs once in the
+master process and the workers inherit the result through copy-on-write.
+No database connection is opened, so nothing unsafe is shared across fork.
+"""
+
+import os
+
+from django.apps import apps
+from django.db import connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+
+
+def warm_url_resolver():
+    """
+    Import every view module and build the reverse() lookup tables.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+
+def warm_model_metadata():
+    """
+    Fill the cached properties of every model's _meta.
+    """
+    for model in apps.get_models():
+        opts = model._meta
+        opts.get_fields()
+        opts.concrete_fields
+        opts.local_concrete_fields
+        opts.related_objects
+        opts._property_names
+        opts.db_returning_fields
+
+
+def template_dirs(engine):
+    """
+    Directories searched by the engine's loaders, including app directories.
+    """
+    dirs = []
+    for loader in engine.engine.template_loaders:
+        for inner in getattr(loader, "loaders", [loader]):
+            dirs.extend(directory for directory in inner.get_dirs() if directory not in dirs)
+    return dirs
+
+
+def warm_templates():
+    """
+    Compile every template into the cached template loader.
+    """
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in template_dirs(engine):
+            for root, _dirs, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith((".html", ".txt")):
+                        name = os.path.relpath(os.path.join(root, filename), directory)
+                        engine.get_template(name.replace(os.sep, "/"))
+
+
+def warm_database_backends():
+    """
+    Import the database backend modules without connecting.
+    """
+    for alias in connections:
+        connections[alias].ops
+
+
+def warm_up():
+    warm_url_resolver()
+    warm_model_metadata()
+    warm_templates()
+    warm_database_backends()